@@ -0,0 +1,12 @@
+"""
+Shared setup for the test scripts in this directory.
+
+pytest loads this once before collecting them: the project root goes on
+sys.path so `core` imports resolve. Scripts run directly
+(`python test_x.py`) already have their own directory as sys.path[0].
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -6,8 +6,10 @@ Handles conversation, context, and response generation.
 """
 
 import os
+import json
 import time
 import requests
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 from core.sanitizer import sanitize_output
@@ -53,6 +55,132 @@ Use emojis to soften the sarcasm when needed.""",
 }
 
 
+# ============================================
+# REPLY CLEANUP
+# Pure functions of the reply text, kept at module level so the cache
+# is keyed on the text alone (not on an engine instance)
+# ============================================
+@lru_cache(maxsize=256)
+def _clean_reply(raw_response: str) -> str:
+    """Sanitize + remove repetition (memoized: canned/retried replies repeat)"""
+    return _remove_repetition(sanitize_output(raw_response))
+
+
+def _remove_repetition(text: str) -> str:
+    """Remove repeated sentences/phrases from response"""
+    if not text:
+        return text
+    
+    # First, handle line-by-line repetitions (most common issue)
+    lines = text.split('\n')
+    unique_lines = []
+    seen_lines = set()
+    
+    for line in lines:
+        line_stripped = line.strip()
+        # Normalize the line for comparison (lowercase, remove extra spaces)
+        line_normalized = ' '.join(line_stripped.lower().split())
+        
+        if line_normalized and line_normalized not in seen_lines:
+            unique_lines.append(line)
+            seen_lines.add(line_normalized)
+        elif not line_normalized:
+            # Keep empty lines for formatting, but limit consecutive empty lines
+            if not unique_lines or unique_lines[-1].strip():
+                unique_lines.append(line)
+    
+    # If after line deduplication we only have one line, also check for 
+    # sentence-level repetition within that line
+    if len([l for l in unique_lines if l.strip()]) <= 1:
+        text = '\n'.join(unique_lines)
+        
+        # Handle sentence-level repetitions
+        sentences = []
+        seen_sentences = set()
+        current = ""
+        
+        for char in text:
+            current += char
+            if char in ".!?":
+                sentence = current.strip()
+                # Normalize for comparison
+                sentence_normalized = ' '.join(sentence.lower().split())
+                if sentence and sentence_normalized not in seen_sentences:
+                    sentences.append(sentence)
+                    seen_sentences.add(sentence_normalized)
+                current = ""
+        
+        # Add any remaining text
+        if current.strip():
+            remaining = current.strip()
+            remaining_normalized = ' '.join(remaining.lower().split())
+            if remaining_normalized not in seen_sentences:
+                sentences.append(remaining)
+        
+        if sentences:
+            text = " ".join(sentences)
+    else:
+        # Multiple unique lines - preserve line structure
+        text = '\n'.join(unique_lines)
+    
+    # Final check: if the result still looks repetitive (same phrase repeated),
+    # try to extract just the first occurrence
+    words = text.split()
+    if len(words) > 20:
+        # Check for 2 repetitions (Halves) - Common case for double-posting
+        half = len(words) // 2
+        # Compare first half vs second half
+        # we compare the normalized strings
+        part1 = ' '.join(words[:half]).lower()
+        # matches the length of part1 to avoid issues with odd number of words
+        part2 = ' '.join(words[half:half+half]).lower()
+        
+        # Check for match - either exact or significantly matching prefix
+        if len(part1) > 30:
+            # Exact match or very strong prefix match (first 100 chars)
+            if part1 == part2 or (len(part1) > 100 and part1[:100] == part2[:100]):
+                text = ' '.join(words[:half])
+                return text.strip()
+        
+        # Check if the first third roughly equals the second third
+        third = len(words) // 3
+        first_third = ' '.join(words[:third]).lower()
+        second_third = ' '.join(words[third:third*2]).lower() if len(words) >= third*2 else ''
+        third_third = ' '.join(words[third*2:third*3]).lower() if len(words) >= third*3 else ''
+        
+        # If any two thirds are similar, likely repetitive
+        if first_third and second_third:
+            # Compare first 80 chars of normalized text
+            if len(first_third) > 30 and len(second_third) > 30:
+                if first_third[:80] == second_third[:80]:
+                    # Return just the first portion plus any remaining unique content
+                    text = ' '.join(words[:third])
+                elif second_third and third_third and second_third[:80] == third_third[:80]:
+                    text = ' '.join(words[:third*2])
+    
+    return text.strip()
+
+
+# ============================================
+# STREAMING
+# ============================================
+def _sse_payloads(response):
+    """JSON payloads of a streamed (server-sent events) response, up to [DONE]"""
+    for line in response.iter_lines():
+        if not line:
+            continue
+        line = line.decode('utf-8')
+        if not line.startswith("data: "):
+            continue
+        data = line[6:]
+        if data == "[DONE]":
+            return
+        try:
+            yield json.loads(data)
+        except ValueError:
+            pass
+
+
 class AIEngine:
     """
     AI Engine for NovaMind.
@@ -65,6 +193,8 @@ class AIEngine:
         self.current_key_index = 0
         self.initialized = False
         self.last_error: Optional[str] = None
+        # Error that cut the last streamed reply short (after text was yielded)
+        self.stream_error: Optional[str] = None
     
     def initialize(self) -> bool:
         """Initialize the AI engine with API keys"""
@@ -128,15 +258,17 @@ class AIEngine:
         """Get list of available modes"""
         return list(MODE_PROMPTS.keys())
     
-    def _make_api_request(self, messages: List[Dict]) -> Dict:
-        """Make a request to OpenRouter API"""
-        headers = {
+    def _build_headers(self) -> Dict[str, str]:
+        """Request headers for the current API key"""
+        return {
             "Authorization": f"Bearer {self._get_current_api_key()}",
             "Content-Type": "application/json",
             "HTTP-Referer": "https://novamind-cli.local",  # Required by OpenRouter
             "X-Title": "NovaMind CLI Chatbot"  # Optional but recommended
         }
-        
+    
+    def _build_payload(self, messages: List[Dict], stream: bool = False) -> Dict:
+        """Request body shared by the blocking and streaming calls"""
         payload = {
             "model": self.config.model,
             "messages": messages,
@@ -147,109 +279,90 @@ class AIEngine:
             "repetition_penalty": 1.2,  # Additional repetition penalty (if model supports it)
             "stop": ["User:", "Human:", "\n\n\n", "</s>", "[/INST]"],  # Stop sequences
         }
+        if stream:
+            payload["stream"] = True
+        return payload
+    
+    def _build_messages(self, user_message: str, context: List[Dict] = None, mood_hint: str = None) -> List[Dict]:
+        """System prompt + conversation history + the current user message"""
+        system_prompt = MODE_PROMPTS.get(self.config.mode, MODE_PROMPTS["friendly"])
+        
+        if mood_hint:
+            system_prompt += f"\n\nThe user seems to be feeling {mood_hint}. Adjust your tone accordingly."
+        
+        # Build messages array
+        messages = [{"role": "system", "content": system_prompt}]
+        
+        # Add context/history if provided
+        if context:
+            for msg in context[:-1]:  # Exclude the current message
+                role = msg.get("role", "user")
+                if role == "model":
+                    role = "assistant"
+                content = msg.get("content", msg.get("parts", [{}])[0].get("text", ""))
+                if content:
+                    messages.append({"role": role, "content": content})
         
+        # Add the current user message
+        messages.append({"role": "user", "content": user_message})
+        return messages
+    
+    def _make_api_request(self, messages: List[Dict]) -> Dict:
+        """Make a request to OpenRouter API"""
         response = requests.post(
             OPENROUTER_API_URL,
-            headers=headers,
-            json=payload,
+            headers=self._build_headers(),
+            json=self._build_payload(messages),
             timeout=60
         )
         
         return response.json()
     
+    def _clean(self, raw_response: str) -> str:
+        """
+        STRICT SANITIZATION PIPELINE for a raw reply:
+        1. Sanitize (remove scaffolding, system prompts, leakages)
+        2. Remove Repetition (handle loops)
+        """
+        return _clean_reply(raw_response)
+    
     def _remove_repetition(self, text: str) -> str:
         """Remove repeated sentences/phrases from response"""
-        if not text:
-            return text
+        return _remove_repetition(text)
+    
+    def _handle_api_error(self, error_obj: Any, error_code: Any = "") -> Optional[str]:
+        """
+        Record an API error and pick the reply for it.
+        Returns None when the error belongs to the key (rate limit, bad
+        key) and another key was switched to - the caller retries.
+        """
+        if isinstance(error_obj, dict):
+            error_msg = error_obj.get("message", str(error_obj))
+            error_code = error_obj.get("code", error_code)
+        else:
+            error_msg = str(error_obj)
         
-        # First, handle line-by-line repetitions (most common issue)
-        lines = text.split('\n')
-        unique_lines = []
-        seen_lines = set()
+        self.last_error = f"Code: {error_code}, Message: {error_msg}"
         
-        for line in lines:
-            line_stripped = line.strip()
-            # Normalize the line for comparison (lowercase, remove extra spaces)
-            line_normalized = ' '.join(line_stripped.lower().split())
-            
-            if line_normalized and line_normalized not in seen_lines:
-                unique_lines.append(line)
-                seen_lines.add(line_normalized)
-            elif not line_normalized:
-                # Keep empty lines for formatting, but limit consecutive empty lines
-                if not unique_lines or unique_lines[-1].strip():
-                    unique_lines.append(line)
+        # Check for quota/rate limit errors (very specific matching)
+        error_lower = error_msg.lower()
+        if error_code == 429 or "rate limit" in error_lower or "quota exceeded" in error_lower:
+            if self._switch_to_next_key():
+                return None
+            return "😅 Rate limit reached. Please try again in a moment!"
         
-        # If after line deduplication we only have one line, also check for 
-        # sentence-level repetition within that line
-        if len([l for l in unique_lines if l.strip()]) <= 1:
-            text = '\n'.join(unique_lines)
-            
-            # Handle sentence-level repetitions
-            sentences = []
-            seen_sentences = set()
-            current = ""
-            
-            for char in text:
-                current += char
-                if char in ".!?":
-                    sentence = current.strip()
-                    # Normalize for comparison
-                    sentence_normalized = ' '.join(sentence.lower().split())
-                    if sentence and sentence_normalized not in seen_sentences:
-                        sentences.append(sentence)
-                        seen_sentences.add(sentence_normalized)
-                    current = ""
-            
-            # Add any remaining text
-            if current.strip():
-                remaining = current.strip()
-                remaining_normalized = ' '.join(remaining.lower().split())
-                if remaining_normalized not in seen_sentences:
-                    sentences.append(remaining)
-            
-            if sentences:
-                text = " ".join(sentences)
-        else:
-            # Multiple unique lines - preserve line structure
-            text = '\n'.join(unique_lines)
+        # Check for invalid/unauthorized key
+        if error_code == 401 or "unauthorized" in error_lower or "invalid api key" in error_lower:
+            if self._switch_to_next_key():
+                return None
+            return f"⚠️ API key issue: {error_msg[:150]}"
         
-        # Final check: if the result still looks repetitive (same phrase repeated),
-        # try to extract just the first occurrence
-        words = text.split()
-        if len(words) > 20:
-            # Check for 2 repetitions (Halves) - Common case for double-posting
-            half = len(words) // 2
-            # Compare first half vs second half
-            # we compare the normalized strings
-            part1 = ' '.join(words[:half]).lower()
-            # matches the length of part1 to avoid issues with odd number of words
-            part2 = ' '.join(words[half:half+half]).lower()
-            
-            # Check for match - either exact or significantly matching prefix
-            if len(part1) > 30:
-                # Exact match or very strong prefix match (first 100 chars)
-                if part1 == part2 or (len(part1) > 100 and part1[:100] == part2[:100]):
-                    text = ' '.join(words[:half])
-                    return text.strip()
-            
-            # Check if the first third roughly equals the second third
-            third = len(words) // 3
-            first_third = ' '.join(words[:third]).lower()
-            second_third = ' '.join(words[third:third*2]).lower() if len(words) >= third*2 else ''
-            third_third = ' '.join(words[third*2:third*3]).lower() if len(words) >= third*3 else ''
-            
-            # If any two thirds are similar, likely repetitive
-            if first_third and second_third:
-                # Compare first 80 chars of normalized text
-                if len(first_third) > 30 and len(second_third) > 30:
-                    if first_third[:80] == second_third[:80]:
-                        # Return just the first portion plus any remaining unique content
-                        text = ' '.join(words[:third])
-                    elif second_third and third_third and second_third[:80] == third_third[:80]:
-                        text = ' '.join(words[:third*2])
+        # Check for model not found
+        if "model" in error_lower and ("not found" in error_lower or "invalid" in error_lower):
+            return f"⚠️ Model not available: {error_msg[:150]}"
         
-        return text.strip()
+        # Show actual error for debugging
+        return f"😓 API Error: {error_msg[:200]}"
     
     def generate_response(
         self, 
@@ -269,27 +382,7 @@ class AIEngine:
             return "😓 All API keys are currently overloaded (Rate Limit). Please try again later."
         
         try:
-            # Build the system prompt
-            system_prompt = MODE_PROMPTS.get(self.config.mode, MODE_PROMPTS["friendly"])
-            
-            if mood_hint:
-                system_prompt += f"\n\nThe user seems to be feeling {mood_hint}. Adjust your tone accordingly."
-            
-            # Build messages array
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Add context/history if provided
-            if context:
-                for msg in context[:-1]:  # Exclude the current message
-                    role = msg.get("role", "user")
-                    if role == "model":
-                        role = "assistant"
-                    content = msg.get("content", msg.get("parts", [{}])[0].get("text", ""))
-                    if content:
-                        messages.append({"role": role, "content": content})
-            
-            # Add the current user message
-            messages.append({"role": "user", "content": user_message})
+            messages = self._build_messages(user_message, context, mood_hint)
             
             # Make API request
             response_data = self._make_api_request(messages)
@@ -299,48 +392,16 @@ class AIEngine:
             
             # Check for errors
             if "error" in response_data:
-                error_obj = response_data["error"]
-                if isinstance(error_obj, dict):
-                    error_msg = error_obj.get("message", str(error_obj))
-                    error_code = error_obj.get("code", "")
-                else:
-                    error_msg = str(error_obj)
-                    error_code = ""
-                
-                self.last_error = f"Code: {error_code}, Message: {error_msg}"
-                
-                # Check for quota/rate limit errors (very specific matching)
-                error_lower = error_msg.lower()
-                if error_code == 429 or "rate limit" in error_lower or "quota exceeded" in error_lower:
-                    if self._switch_to_next_key():
-                         # Pass incremented attempt_count
-                        return self.generate_response(user_message, context, mood_hint, attempt_count + 1)
-                    return "😅 Rate limit reached. Please try again in a moment!"
-                
-                # Check for invalid/unauthorized key
-                if error_code == 401 or "unauthorized" in error_lower or "invalid api key" in error_lower:
-                    if self._switch_to_next_key():
-                        return self.generate_response(user_message, context, mood_hint, attempt_count + 1)
-                    return f"⚠️ API key issue: {error_msg[:150]}"
-                
-                # Check for model not found
-                if "model" in error_lower and ("not found" in error_lower or "invalid" in error_lower):
-                    return f"⚠️ Model not available: {error_msg[:150]}"
-                
-                # Show actual error for debugging
-                return f"😓 API Error: {error_msg[:200]}"
+                error_reply = self._handle_api_error(response_data["error"])
+                if error_reply is None:
+                    # Switched to the next key - pass incremented attempt_count
+                    return self.generate_response(user_message, context, mood_hint, attempt_count + 1)
+                return error_reply
             
             # Extract response text
             if "choices" in response_data and len(response_data["choices"]) > 0:
                 raw_response = response_data["choices"][0]["message"]["content"].strip()
-                
-                # STRICT SANITIZATION PIPELINE
-                # 1. Sanitize (remove scaffolding, system prompts, leakages)
-                from core.sanitizer import sanitize_output
-                clean_response = sanitize_output(raw_response)
-                
-                # 2. Remove Repetition (handle loops)
-                return self._remove_repetition(clean_response)
+                return self._clean(raw_response)
             
             return "😓 No response received from AI."
             
@@ -361,66 +422,87 @@ class AIEngine:
         """
         Generate streaming AI response (yields chunks).
         
+        Same prompt, history and key rotation as generate_response, but
+        text is yielded as it arrives. Output is raw: the caller sanitizes
+        it, and there is no after-the-fact repetition trimming.
+        
+        An error before any text is yielded as the reply, like the ones
+        generate_response returns. An error after text has gone out ends
+        the stream and is kept in stream_error instead, so it does not
+        become part of the reply.
+        
         Yields:
             Response text chunks
         """
+        self.stream_error = None
         if not self.initialized:
-            yield "⚠️ AI is not initialized."
+            yield "⚠️ AI is not initialized. Please check your API key configuration."
             return
         
+        yielded = False
         try:
-            system_prompt = MODE_PROMPTS.get(self.config.mode, MODE_PROMPTS["friendly"])
-            
-            if mood_hint:
-                system_prompt += f"\n\nThe user seems to be feeling {mood_hint}."
+            messages = self._build_messages(user_message, context, mood_hint)
             
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ]
-            
-            headers = {
-                "Authorization": f"Bearer {self._get_current_api_key()}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://novamind-cli.local",
-                "X-Title": "NovaMind CLI Chatbot"
-            }
-            
-            payload = {
-                "model": self.config.model,
-                "messages": messages,
-                "max_tokens": self.config.max_tokens,
-                "temperature": self.config.temperature,
-                "stream": True
-            }
-            
-            response = requests.post(
-                OPENROUTER_API_URL,
-                headers=headers,
-                json=payload,
-                timeout=60,
-                stream=True
-            )
-            
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith("data: "):
-                        data = line[6:]
-                        if data == "[DONE]":
-                            break
-                        try:
-                            import json
-                            chunk_data = json.loads(data)
-                            if "choices" in chunk_data and len(chunk_data["choices"]) > 0:
+            # Errors before any text are retried with the next key as
+            # generate_response does (each key at most once)
+            for _ in range(len(self.api_keys) + 1):
+                response = requests.post(
+                    OPENROUTER_API_URL,
+                    headers=self._build_headers(),
+                    json=self._build_payload(messages, stream=True),
+                    timeout=60,
+                    stream=True
+                )
+                # Closed however the stream ends, consumer stopping early included
+                with response:
+                    if response.status_code == 200:
+                        error_obj, error_code = None, ""
+                        for chunk_data in _sse_payloads(response):
+                            # OpenRouter reports failures mid-stream as an error payload
+                            if "error" in chunk_data:
+                                error_obj = chunk_data["error"]
+                                break
+                            if chunk_data.get("choices"):
                                 delta = chunk_data["choices"][0].get("delta", {})
-                                if "content" in delta:
+                                if delta.get("content"):
+                                    yielded = True
                                     yield delta["content"]
-                        except:
-                            pass
-                            
+                        if error_obj is None:
+                            if not yielded:
+                                # 200 without any text: an empty reply, not a reason to resend
+                                yield "😓 No response received from AI."
+                            return
+                    else:
+                        try:
+                            error_obj = response.json().get("error") or response.reason
+                        except ValueError:
+                            error_obj = response.reason
+                        error_code = response.status_code
+                
+                error_reply = self._handle_api_error(error_obj or "", error_code)
+                if yielded:
+                    # Too late to retry: the reply is partly out
+                    self.stream_error = error_reply or f"😓 API Error: {self.last_error}"
+                    return
+                if error_reply is not None:
+                    yield error_reply
+                    return
+            
+            yield "😓 All API keys are currently overloaded (Rate Limit). Please try again later."
+            return
+        
+        except requests.exceptions.Timeout:
+            error_reply = "⏱️ Request timed out. Please try again."
+        except requests.exceptions.ConnectionError:
+            error_reply = "🌐 Connection error. Please check your internet connection."
         except Exception as e:
-            yield f"😓 Error: {str(e)[:100]}"
+            self.last_error = str(e)
+            error_reply = f"😓 Error: {str(e)[:100]}"
+        
+        if yielded:
+            self.stream_error = error_reply
+        else:
+            yield error_reply
     
     def get_quick_response(self, prompt: str) -> str:
         """Get a quick response without context (for games, etc.)"""
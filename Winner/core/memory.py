@@ -87,6 +87,11 @@ class ConversationMemory:
         self.current_theme: str = "neon"
         self._last_user_message_time: float = 0
     
+    @property
+    def message_count(self) -> int:
+        """Messages exchanged this session (O(1), unlike get_session_summary)"""
+        return self.stats.message_count
+    
     def add_message(self, role: str, content: str, mood: str = "neutral"):
         """Add a message to conversation history"""
         timestamp = time.time()
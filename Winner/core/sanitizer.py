@@ -33,6 +33,80 @@ REASONING_PATTERNS = [
     r"(?i)^scratchpad:"
 ]
 
+# Special tokens removed from the text (ChatML, Llama/Mistral), in order
+_TOKEN_PATTERNS = [
+    re.compile(r"<\|im_start\|>\s*\w+\s*", re.IGNORECASE),
+    re.compile(r"<\|im_end\|>", re.IGNORECASE),
+    re.compile(r"<\|im_sep\|>", re.IGNORECASE),
+    re.compile(r"<s>|</s>", re.IGNORECASE),
+    re.compile(r"\[/?INST\]", re.IGNORECASE),
+    re.compile(r"<\/?s>", re.IGNORECASE),
+]
+
+# Role prefixes stripped from the start of a line (e.g. "NovaMind: Hello")
+_ROLE_PATTERN = re.compile(r"^(System|Assistant|User|NovaMind|AI|Model)(:\s*|\s*$)", re.IGNORECASE)
+
+# Everything before the first "Final Answer:" line is dropped
+_FINAL_ANSWER_PATTERN = re.compile(r"(?i)^final answer:\s*", re.MULTILINE)
+
+# Any reasoning marker at the start of a line (REASONING_PATTERNS combined)
+_REASONING_PATTERN = re.compile(
+    "|".join(pattern.replace("(?i)", "") for pattern in REASONING_PATTERNS),
+    re.IGNORECASE
+)
+
+# Phrases that drop a line wherever they appear in it (not just at the start)
+_ANYWHERE_PHRASES = ["<|im_start|>", "<|im_end|>", "[DEBUG]", "[THOUGHT]"]
+
+
+def _strip_tokens(text: str) -> str:
+    """Step 1: remove special tokens"""
+    for pattern in _TOKEN_PATTERNS:
+        text = pattern.sub("", text)
+    return text
+
+
+def _filter_line(line: str, inside_code_block: bool):
+    """
+    Step 2 for one line: (line to keep or None, new inside_code_block).
+    """
+    stripped_line = line.strip()
+    
+    # Track code blocks - we generally preserve content inside code blocks
+    if stripped_line.startswith("```"):
+        return line, not inside_code_block
+        
+    if inside_code_block:
+        return line, inside_code_block
+        
+    # Skip empty lines (we'll handle spacing later)
+    if not stripped_line:
+        return line, inside_code_block
+        
+    # CHECK FOR FORBIDDEN PHRASES
+    for phrase in FORBIDDEN_PHRASES:
+        # Check if line *starts with* or *strongly contains* scaffolding
+        if phrase.lower() in stripped_line.lower():
+            # Context check: "Assistant:" at start of line is bad. 
+            # Strict start check for roles or forbidden phrases
+            if stripped_line.lower().startswith(phrase.lower()) or \
+               phrase in _ANYWHERE_PHRASES:
+                return None, inside_code_block
+        
+    # CHECK FOR ROLE PREFIXES (e.g. "NovaMind: Hello")
+    # Handles "Assistant: ", "Assistant", "AI: "
+    role_match = _ROLE_PATTERN.match(stripped_line)
+    if role_match:
+        # Remove the prefix but keep the content
+        content = line[role_match.end():]
+        # If content is empty/whitespace (e.g. just "Assistant"), we drop the line 
+        if content.strip():
+            return content, inside_code_block
+        return None, inside_code_block
+        
+    return line, inside_code_block
+
+
 def sanitize_output(text: str) -> str:
     """
     Main sanitization pipeline function.
@@ -46,69 +120,17 @@ def sanitize_output(text: str) -> str:
     if not text:
         return ""
         
-    cleaned = text
-    
     # 1. SPECIAL TOKEN REMOVAL (Regex based for better coverage)
-    # Remove <|im_start|>role and <|im_end|>
-    cleaned = re.sub(r"<\|im_start\|>\s*\w+\s*", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"<\|im_end\|>", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"<\|im_sep\|>", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"<s>|</s>", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"\[/?INST\]", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"<\/?s>", "", cleaned, flags=re.IGNORECASE)
+    cleaned = _strip_tokens(text)
         
     # 2. LINE-BASED FILTERING
-    lines = cleaned.split('\n')
     filtered_lines = []
-    
     inside_code_block = False
     
-    for line in lines:
-        stripped_line = line.strip()
-        
-        # Track code blocks - we generally preserve content inside code blocks
-        if stripped_line.startswith("```"):
-            inside_code_block = not inside_code_block
-            filtered_lines.append(line)
-            continue
-            
-        if inside_code_block:
-            filtered_lines.append(line)
-            continue
-            
-        # Skip empty lines (we'll handle spacing later)
-        if not stripped_line:
+    for line in cleaned.split('\n'):
+        line, inside_code_block = _filter_line(line, inside_code_block)
+        if line is not None:
             filtered_lines.append(line)
-            continue
-            
-        # CHECK FOR FORBIDDEN PHRASES
-        is_forbidden = False
-        for phrase in FORBIDDEN_PHRASES:
-            # Check if line *starts with* or *strongly contains* scaffolding
-            if phrase.lower() in stripped_line.lower():
-                # Context check: "Assistant:" at start of line is bad. 
-                # Strict start check for roles or forbidden phrases
-                if stripped_line.lower().startswith(phrase.lower()) or \
-                   phrase in ["<|im_start|>", "<|im_end|>", "[DEBUG]", "[THOUGHT]"]:
-                    is_forbidden = True
-                    break
-        
-        if is_forbidden:
-            continue
-            
-        # CHECK FOR ROLE PREFIXES (e.g. "NovaMind: Hello")
-        # Handles "Assistant: ", "Assistant", "AI: "
-        role_match = re.match(r"^(System|Assistant|User|NovaMind|AI|Model)(:\s*|\s*$)", stripped_line, re.IGNORECASE)
-        if role_match:
-            # Remove the prefix but keep the content
-            content = line[role_match.end():]
-            if content.strip():
-                filtered_lines.append(content)
-            # If content is empty/whitespace (e.g. just "Assistant"), we drop the line 
-            # (which effectively happens by not appending if content.strip() is empty)
-            continue
-            
-        filtered_lines.append(line)
         
     cleaned = '\n'.join(filtered_lines)
     
@@ -117,12 +139,144 @@ def sanitize_output(text: str) -> str:
     # IF and ONLY IF we detect substantial reasoning text before it.
     
     # Simple heuristic: If "Final Answer:" exists, take everything after it.
-    final_answer_match = re.search(r"(?i)^final answer:\s*", cleaned, re.MULTILINE)
+    final_answer_match = _FINAL_ANSWER_PATTERN.search(cleaned)
     if final_answer_match:
         cleaned = cleaned[final_answer_match.end():]
         
     return cleaned.strip()
 
+
+# A line still being received is judged from its first complete words
+# once there are this many (non-blank) chars of them
+_DECIDE_CHARS = 32
+
+
+def sanitize_stream(chunks):
+    """
+    sanitize_output for a reply arriving in pieces, as a generator.
+    
+    Yields sanitized text as soon as the line rules have settled it, and
+    None when the text yielded so far turns out to be void: a "Final
+    Answer:" line drops everything before it. A reply opening with a
+    reasoning marker (Reasoning:, Analysis:, ...) is held back until its
+    Final Answer or the end, since that is where such replies go.
+    
+    Each raw line is handled once (long lines a word run at a time), so
+    the work is linear in the reply. The pieces after the last None join
+    to sanitize_output(full text) except for whole-text cases a line at a
+    time cannot see, e.g. a token spanning lines or a [DEBUG] marker late
+    in a long line - callers compare with sanitize_output at the end.
+    """
+    inside_code_block = False
+    final_seen = False
+    started = False    # content yielded since the last reset
+    holding = False    # reasoning preamble: collect instead of yielding
+    held = ""          # whitespace/newlines, yielded only if content follows
+    out = []           # results of the current piece, yielded after it
+    hold_buffer = []
+    
+    def reset():
+        nonlocal started, holding, held
+        out.append(None)
+        started = holding = False
+        held = ""
+        hold_buffer.clear()
+    
+    def content(text):
+        nonlocal started, held
+        if not text.strip():
+            # Leading whitespace is dropped (final strip), the rest waits
+            if started:
+                held += text
+            return
+        if not started:
+            text = text.lstrip()
+            started = True
+        # Trailing whitespace waits too: it is dropped if the reply ends here
+        body = text.rstrip()
+        (hold_buffer if holding else out).append(held + body)
+        held = text[len(body):]
+    
+    def newline():
+        nonlocal held
+        if started:
+            held += "\n"
+    
+    def kept_line(kept):
+        """Final Answer / reasoning checks for a kept line, then its text"""
+        nonlocal final_seen, holding
+        if not final_seen:
+            match = _FINAL_ANSWER_PATTERN.match(kept)
+            if match:
+                final_seen = True
+                reset()
+                kept = kept[match.end():]
+            elif not started and _REASONING_PATTERN.match(kept.strip()):
+                holding = True
+        content(kept)
+    
+    def whole_line(raw_line):
+        """Complete raw line (no newline): True if it was kept"""
+        nonlocal inside_code_block
+        kept, inside_code_block = _filter_line(_strip_tokens(raw_line), inside_code_block)
+        if kept is None:
+            return False
+        kept_line(kept)
+        return True
+    
+    line = ""          # raw text of the current line not handled yet
+    line_state = None  # None: undecided, True: kept so far, False: dropped
+    
+    for piece in chunks:
+        search_from = len(line)
+        line += piece
+        newline_at = line.find("\n", search_from)
+        
+        while newline_at >= 0:
+            rest = line[newline_at + 1:]
+            line = line[:newline_at]
+            if line_state is None:
+                if whole_line(line):
+                    newline()
+            elif line_state:
+                content(_strip_tokens(line))
+                newline()
+            line, line_state = rest, None
+            newline_at = line.find("\n")
+        
+        # Incomplete line: decide from its first words, then pass complete
+        # words on as they arrive
+        if line_state is None:
+            cut = line.rfind(" ")
+            head = line[:cut].strip()
+            if len(head) >= _DECIDE_CHARS and not head.startswith("`"):
+                kept, _ = _filter_line(_strip_tokens(line[:cut]), inside_code_block)
+                line_state = kept is not None
+                if line_state:
+                    kept_line(kept)
+                line = line[cut:] if line_state else ""
+        elif line_state:
+            cut = line.rfind(" ")
+            # A role token swallows the word after it - keep them together
+            while cut > 0 and line[:cut].rstrip().lower().endswith("<|im_start|>"):
+                cut = line.rfind(" ", 0, cut)
+            if cut > 0:
+                content(_strip_tokens(line[:cut]))
+                line = line[cut:]
+        else:
+            line = ""
+        
+        yield from out
+        out.clear()
+    
+    if line_state is None:
+        whole_line(line)
+    elif line_state:
+        content(_strip_tokens(line))
+    yield from out
+    yield from hold_buffer
+
+
 def unit_test_sanitizer():
     """Run verification tests on the sanitizer"""
     test_cases = [
@@ -13,6 +13,35 @@ import queue
 import platform
 from typing import Optional, Dict
 
+
+# Queue payloads are small ints (CPython caches these, so no per-event
+# allocation): keystroke codes below _TYPE_NOTIFY index _KEYSTROKE_PARAMS
+_TYPE_KEY_MECH = 0
+_TYPE_KEY_SOFT = 1
+_TYPE_KEY_RETRO = 2
+_TYPE_KEY_DEFAULT = 3
+_TYPE_NOTIFY = 16
+
+_STYLE_CODES = {
+    "mechanical": _TYPE_KEY_MECH,
+    "soft": _TYPE_KEY_SOFT,
+    "retro": _TYPE_KEY_RETRO,
+}
+
+# (frequency, duration) per keystroke code
+_KEYSTROKE_PARAMS = (
+    (800, 15),   # mechanical
+    (400, 10),   # soft
+    (1200, 20),  # retro
+    (600, 15),   # anything else
+)
+
+
+def _noop(*args, **kwargs):
+    """Stand-in for the queue methods while sound is disabled"""
+    return None
+
+
 class SoundEngine:
     """
     Non-blocking sound engine with thread-safe queue.
@@ -52,12 +81,28 @@ class SoundEngine:
         # Initialize backend
         self._init_backend()
         
+        # Keep the real queue methods around so set_enabled() can swap
+        # them for a no-op while sound is off (the default)
+        self._real_queue_keystroke = self.queue_keystroke_sound
+        self._real_queue_notification = self.queue_notification
+        self.queue_keystroke_sound = _noop
+        self.queue_notification = _noop
+        
         # Start worker
         self.start()
         
         self._initialized = True
         print("  [Sound] Engine initialized.")
 
+    @property
+    def style(self) -> str:
+        return self._style
+    
+    @style.setter
+    def style(self, value: str):
+        self._style = value
+        self._style_code = _STYLE_CODES.get(value, _TYPE_KEY_DEFAULT)
+
     def _init_backend(self):
         """Initialize platform-specific sound libraries"""
         try:
@@ -102,7 +147,14 @@ class SoundEngine:
     def set_enabled(self, enabled: bool):
         """Toggle sound on/off"""
         self.enabled = enabled
-        if not enabled:
+        if enabled:
+            self.queue_keystroke_sound = self._real_queue_keystroke
+            self.queue_notification = self._real_queue_notification
+        else:
+            # Callers skip straight through a no-op while disabled
+            self.queue_keystroke_sound = _noop
+            self.queue_notification = _noop
+            
             # Clear pending sounds when disabling
             with self.sound_queue.mutex:
                 self.sound_queue.queue.clear()
@@ -118,7 +170,7 @@ class SoundEngine:
             
         try:
             # Non-blocking put, skip if full (safety valve)
-            self.sound_queue.put_nowait(("type", self.style))
+            self.sound_queue.put_nowait(self._style_code)
             self.last_sound_time = now
         except queue.Full:
             pass 
@@ -128,7 +180,7 @@ class SoundEngine:
         if not self.enabled:
             return
         try:
-            self.sound_queue.put_nowait(("notify", type))
+            self.sound_queue.put_nowait(_TYPE_NOTIFY)
         except queue.Full:
             pass
 
@@ -138,16 +190,14 @@ class SoundEngine:
             try:
                 # Wait for sound task (short timeout to check stop_event)
                 try:
-                    task = self.sound_queue.get(timeout=0.1)
+                    code = self.sound_queue.get(timeout=0.1)
                 except queue.Empty:
                     continue
                 
-                sound_type, data = task
-                
-                if sound_type == "type":
-                    self._play_keystroke(data)
-                elif sound_type == "notify":
-                    self._play_notification(data)
+                if code < _TYPE_NOTIFY:
+                    self._play_keystroke_by_code(code)
+                else:
+                    self._play_notification_default()
                     
                 self.sound_queue.task_done()
                 
@@ -156,24 +206,15 @@ class SoundEngine:
                 # print(f"Sound Error: {e}") 
                 pass
 
-    def _play_keystroke(self, style):
-        """Execute the actual sound play (blocking is ok here)"""
-        # Frequencies for different styles
-        if style == "mechanical":
-            freq = 800
-            dur = 15
-        elif style == "soft":
-            freq = 400
-            dur = 10
-        elif style == "retro":
-            freq = 1200
-            dur = 20
-        else:
-            freq = 600
-            dur = 15
-            
+    def _play_keystroke_by_code(self, code):
+        """Play a keystroke from its queued style code"""
+        freq, dur = _KEYSTROKE_PARAMS[code]
         self.play_func(freq, dur)
 
+    def _play_notification_default(self):
+        """Play the notification sound for a queued _TYPE_NOTIFY"""
+        self._play_notification("default")
+
     def _play_notification(self, type):
         """Execute notification sound"""
         if self.system == "windows" and self.has_sound_lib:
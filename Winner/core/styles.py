@@ -203,6 +203,45 @@ THEMES: Dict[str, ThemeColors] = {
 }
 
 
+# ============================================
+# ANIMATION & BOX CHARACTERS
+# Built once and shared by every caller, so spinners and
+# waveforms don't rebuild their frame lists on each call
+# ============================================
+
+_GRADIENT = ("░", "▒", "▓", "█")
+
+_WAVEFORM = ("▁", "▂", "▃", "▄", "▅", "▆", "▇", "█")
+
+_SPINNERS: Dict[str, tuple] = {
+    "dots": ("⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"),
+    "braille": ("⣾", "⣽", "⣻", "⢿", "⡿", "⣟", "⣯", "⣷"),
+    "moon": ("🌑", "🌒", "🌓", "🌔", "🌕", "🌖", "🌗", "🌘"),
+    "arrows": ("←", "↖", "↑", "↗", "→", "↘", "↓", "↙"),
+    "bounce": ("⠁", "⠂", "⠄", "⡀", "⢀", "⠠", "⠐", "⠈"),
+    "pulse": ("█", "▓", "▒", "░", "▒", "▓"),
+}
+
+_BOXES: Dict[str, Dict[str, str]] = {
+    "rounded": {
+        "tl": "╭", "tr": "╮", "bl": "╰", "br": "╯",
+        "h": "─", "v": "│", "cross": "┼"
+    },
+    "sharp": {
+        "tl": "┌", "tr": "┐", "bl": "└", "br": "┘",
+        "h": "─", "v": "│", "cross": "┼"
+    },
+    "double": {
+        "tl": "╔", "tr": "╗", "bl": "╚", "br": "╝",
+        "h": "═", "v": "║", "cross": "╬"
+    },
+    "heavy": {
+        "tl": "┏", "tr": "┓", "bl": "┗", "br": "┛",
+        "h": "━", "v": "┃", "cross": "╋"
+    },
+}
+
+
 class StyleManager:
     """
     Manages the current theme and provides styling utilities.
@@ -262,47 +301,21 @@ class StyleManager:
         }
         return mood_colors.get(mood.lower(), self.theme.ai_text)
     
-    def get_gradient_chars(self) -> list:
+    def get_gradient_chars(self) -> tuple:
         """Get gradient block characters for visual effects"""
-        return ["░", "▒", "▓", "█"]
+        return _GRADIENT
     
-    def get_waveform_chars(self) -> list:
+    def get_waveform_chars(self) -> tuple:
         """Get waveform characters for voice visualization"""
-        return ["▁", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
+        return _WAVEFORM
     
-    def get_spinner_frames(self, style: str = "dots") -> list:
+    def get_spinner_frames(self, style: str = "dots") -> tuple:
         """Get spinner animation frames"""
-        spinners = {
-            "dots": ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"],
-            "braille": ["⣾", "⣽", "⣻", "⢿", "⡿", "⣟", "⣯", "⣷"],
-            "moon": ["🌑", "🌒", "🌓", "🌔", "🌕", "🌖", "🌗", "🌘"],
-            "arrows": ["←", "↖", "↑", "↗", "→", "↘", "↓", "↙"],
-            "bounce": ["⠁", "⠂", "⠄", "⡀", "⢀", "⠠", "⠐", "⠈"],
-            "pulse": ["█", "▓", "▒", "░", "▒", "▓"],
-        }
-        return spinners.get(style, spinners["dots"])
+        return _SPINNERS.get(style, _SPINNERS["dots"])
     
     def get_box_chars(self, style: str = "rounded") -> dict:
-        """Get box drawing characters"""
-        boxes = {
-            "rounded": {
-                "tl": "╭", "tr": "╮", "bl": "╰", "br": "╯",
-                "h": "─", "v": "│", "cross": "┼"
-            },
-            "sharp": {
-                "tl": "┌", "tr": "┐", "bl": "└", "br": "┘",
-                "h": "─", "v": "│", "cross": "┼"
-            },
-            "double": {
-                "tl": "╔", "tr": "╗", "bl": "╚", "br": "╝",
-                "h": "═", "v": "║", "cross": "╬"
-            },
-            "heavy": {
-                "tl": "┏", "tr": "┓", "bl": "┗", "br": "┛",
-                "h": "━", "v": "┃", "cross": "╋"
-            },
-        }
-        return boxes.get(style, boxes["rounded"])
+        """Get box drawing characters (shared - do not mutate)"""
+        return _BOXES.get(style, _BOXES["rounded"])
 
 
 # Global style manager instance
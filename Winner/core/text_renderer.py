@@ -3,11 +3,14 @@ NovaMind Text Renderer Module - FIXED VERSION
 """
 
 import re
-import shutil
 import textwrap
+from functools import lru_cache
 from typing import List, Tuple
 from rich.cells import cell_len
 
+from .sanitizer import sanitize_output, sanitize_stream
+from .utils import get_terminal_size
+
 ANSI_ESCAPE_PATTERN = re.compile(r'\x1b\[[0-9;]*m')
 ANSI_BOLD = '\x1b[1m'
 ANSI_RESET = '\x1b[0m'
@@ -35,6 +38,11 @@ TOKENS_TO_STRIP = [
     f'{_LT}{_PIPE}assistant{_PIPE}{_GT}',
 ]
 
+# Whitespace cleanup after token removal, compiled once
+MULTI_NEWLINE_PATTERN = re.compile(r'\n{3,}')
+MULTI_SPACE_PATTERN = re.compile(r' {2,}')
+_strip = str.strip
+
 
 def sanitize_ai_response(text):
     """
@@ -55,10 +63,10 @@ def sanitize_ai_response(text):
         result = result.replace(token, '')
     
     # Clean up multiple spaces/newlines that may result from removal
-    result = re.sub(r'\n{3,}', '\n\n', result)
-    result = re.sub(r' {2,}', ' ', result)
+    result = MULTI_NEWLINE_PATTERN.sub('\n\n', result)
+    result = MULTI_SPACE_PATTERN.sub(' ', result)
     
-    return result.strip()
+    return _strip(result)
 
 
 def strip_ansi(text):
@@ -74,6 +82,16 @@ def visible_width(text):
     return cell_len(strip_ansi(text))
 
 
+def _visible_width_raw(text):
+    """visible_width() for text already known to contain no ANSI codes."""
+    return cell_len(text)
+
+
+def get_terminal_columns():
+    """Cached terminal width in columns (see utils.get_terminal_size)."""
+    return get_terminal_size()[0]
+
+
 MARKDOWN_BOLD_PATTERN = re.compile(r'\*\*(.+?)\*\*')
 
 
@@ -123,81 +141,102 @@ def wrap_text_preserve_ansi(text, width):
     # We always use our custom logic to be safe with wide chars,
     # even if no ANSI codes are present, because python's textwrap
     # doesn't handle 'visible width' (columns) but just 'characters'.
+    filler = _LineFiller(width)
+    lines = filler.feed(text)
+    lines.extend(filler.finish())
+    return lines
+
+
+class _LineFiller:
+    """
+    Greedy line filling for wrap_text_preserve_ansi, fed text in pieces.
     
-    lines = []
-    current_line = ''
-    current_visible_width = 0
+    feed() returns the lines completed by the new text - a line is done
+    once a word no longer fits or its paragraph ends, so more text never
+    changes it. Pieces must split the text between words (at a space or
+    newline); finish() returns the rest.
+    """
     
-    paragraphs = text.split('\n')
+    def __init__(self, width):
+        self.width = width
+        self.current_line = ''
+        self.current_visible_width = 0
+        self.paragraph_started = False  # any text since the last newline
+    
+    def feed(self, text):
+        lines = []
+        paragraphs = text.split('\n')
+        self._add_words(paragraphs[0], lines)
+        for paragraph in paragraphs[1:]:
+            self._end_paragraph(lines)
+            self._add_words(paragraph, lines)
+        return lines
     
-    for para_idx, paragraph in enumerate(paragraphs):
+    def finish(self):
+        lines = []
+        self._end_paragraph(lines)
+        return lines
+    
+    def _end_paragraph(self, lines):
         # Handle empty paragraphs (newlines)
-        if not paragraph:
-            if current_line:
-                lines.append(current_line)
-                current_line = ''
-                current_visible_width = 0
+        if not self.paragraph_started:
             lines.append('')
-            continue
-
-        words = paragraph.split(' ')
+        elif self.current_line:
+            lines.append(self.current_line)
+            self.current_line = ''
+            self.current_visible_width = 0
+        self.paragraph_started = False
+    
+    def _add_words(self, paragraph, lines):
+        if not paragraph:
+            return
+        self.paragraph_started = True
+        width = self.width
         
-        for i, word in enumerate(words):
+        for word in paragraph.split(' '):
             if not word: continue
             
-            word_visible = visible_width(word)
+            # Skip the ANSI strip for words without escapes
+            has_ansi = '\x1b' in word
+            vw = visible_width if has_ansi else _visible_width_raw
+            word_visible = vw(word)
             
             # Add space width if not the first word
-            space_needed = 1 if current_visible_width > 0 else 0
+            space_needed = 1 if self.current_visible_width > 0 else 0
             
-            if current_visible_width + space_needed + word_visible <= width:
-                if current_visible_width > 0:
-                    current_line += ' '
-                    current_visible_width += 1
-                current_line += word
-                current_visible_width += word_visible
+            if self.current_visible_width + space_needed + word_visible <= width:
+                if self.current_visible_width > 0:
+                    self.current_line += ' '
+                    self.current_visible_width += 1
+                self.current_line += word
+                self.current_visible_width += word_visible
             else:
                 # Word doesn't fit
-                if current_line:
-                    lines.append(current_line)
-                    current_line = ''
-                    current_visible_width = 0
+                if self.current_line:
+                    lines.append(self.current_line)
                 
                 # If word itself is longer than width, force split
                 if word_visible > width:
                     remaining = word
-                    while visible_width(remaining) > width:
-                        break_point = _find_break_point(remaining, width)
-                        chunk = remaining[:break_point]
-                        lines.append(chunk)
+                    while vw(remaining) > width:
+                        break_point = _find_break_point(remaining, width, has_ansi)
+                        lines.append(remaining[:break_point])
                         remaining = remaining[break_point:]
-                    current_line = remaining
-                    current_visible_width = visible_width(remaining)
+                    self.current_line = remaining
+                    self.current_visible_width = vw(remaining)
                 else:
-                    current_line = word
-                    current_visible_width = word_visible
-        
-        if current_line:
-            lines.append(current_line)
-            current_line = ''
-            current_visible_width = 0
-            
-        # Add a newline if this isn't the last paragraph?
-        # text.split('\n') consumes the newlines.
-        # Logic above handles explicit empty strings as blank lines.
-        # But normal paragraphs just get added. 
-    
-    return lines
+                    self.current_line = word
+                    self.current_visible_width = word_visible
 
 
-def _find_break_point(text, max_width):
+def _find_break_point(text, max_width, has_ansi=True):
     """Find where to break text for wrapping, respecting ANSI and wide chars."""
     visible_count = 0
     i = 0
     length = len(text)
     
     while i < length:
-        if text[i] == '\x1b':
+        if has_ansi and text[i] == '\x1b':
             match = ANSI_ESCAPE_PATTERN.match(text, i)
             if match:
                 i = match.end()
@@ -218,10 +257,9 @@ def _find_break_point(text, max_width):
 
 def render_line_in_box(line, inner_width, prefix="  |  "):
     """Render a line within a box with proper padding."""
-    visible = visible_width(line)
-    padding_needed = max(0, inner_width - visible)
-    padding = ' ' * padding_needed
-    return f"{prefix}{line}{padding}"
+    padding_needed = max(0, inner_width - visible_width(line))
+    # Format-spec padding writes the spaces straight into the result
+    return f"{prefix}{line}{'':<{padding_needed}}"
 
 
 def prepare_response_for_box(response, box_width=70, terminal_width=None):
@@ -235,7 +273,7 @@ def prepare_response_for_box(response, box_width=70, terminal_width=None):
     4. Return wrapped lines and inner width
     """
     if terminal_width is None:
-        terminal_width = shutil.get_terminal_size().columns
+        terminal_width = get_terminal_columns()
     
     # Ensure box fits in terminal
     actual_box_width = min(box_width, terminal_width - 4)
@@ -253,7 +291,88 @@ def prepare_response_for_box(response, box_width=70, terminal_width=None):
     return wrapped_lines, inner_width
 
 
+@lru_cache(maxsize=64)
+def _prepare_cached(response, box_width, terminal_width):
+    """prepare_response_for_box, memoized: (wrapped lines tuple, inner width)"""
+    lines, inner_width = prepare_response_for_box(response, box_width, terminal_width)
+    return tuple(lines), inner_width
+
+
+def _settled_length(text):
+    """
+    Length of the prefix of partially received (sanitized) text that
+    more text cannot change: whole lines, then complete words as long as
+    no **bold** marker on the last line is left open.
+    """
+    line_start = text.rfind('\n') + 1
+    cut = text.rfind(' ', line_start)
+    if cut < 0 or text.count('**', line_start, cut) % 2:
+        return line_start
+    return cut
+
+
+def stream_box_lines(chunks, box_width=70, terminal_width=None, finish=sanitize_output):
+    """
+    Render a reply arriving in pieces into box lines, as a generator.
+    
+    finish gives the final text from the full raw reply (sanitize_output,
+    or a wrapper of it), None for text that needs no cleaning. While the
+    chunks arrive the text goes through sanitize_stream, and each settled
+    run of it through bold conversion and the line filler, so every piece
+    is handled once. Each finished line is yielded as soon as more text
+    can no longer change it, paired with the raw text received so far.
+    
+    (None, raw text) means the lines yielded so far are void and the box
+    starts over: a "Final Answer:" cut while streaming, or a final text
+    (checked against finish(raw text) when the chunks run out) that does
+    not begin with the lines already shown.
+    """
+    if terminal_width is None:
+        terminal_width = get_terminal_columns()
+    _, inner_width = prepare_response_for_box("", box_width, terminal_width)
+    
+    raw = ""
+    
+    def received():
+        nonlocal raw
+        for piece in chunks:
+            raw += piece
+            yield piece
+    
+    pieces = received() if finish is None else sanitize_stream(received())
+    filler = _LineFiller(inner_width)
+    shown = []
+    pending = ""
+    for piece in pieces:
+        if piece is None:
+            if shown:
+                yield None, raw
+            filler = _LineFiller(inner_width)
+            shown = []
+            pending = ""
+            continue
+        
+        pending += piece
+        settled = _settled_length(pending)
+        if not settled:
+            continue
+        for line in filler.feed(parse_markdown_bold(pending[:settled])):
+            shown.append(line)
+            yield line, raw
+        pending = pending[settled:]
+    
+    # Chunks exhausted - the final text decides. Complete replies do
+    # repeat (canned answers, retries), so this goes through the cache.
+    final = raw if finish is None else finish(raw)
+    lines = _prepare_cached(final, box_width, terminal_width)[0]
+    if lines[:len(shown)] != tuple(shown):
+        yield None, raw
+        shown = []
+    for line in lines[len(shown):]:
+        yield line, raw
+
+
 def get_default_box_width():
     """Get a reasonable default box width."""
-    term_width = shutil.get_terminal_size().columns
+    term_width = get_terminal_columns()
     return min(70, term_width - 4)
@@ -24,9 +24,53 @@ ANSI by default.
 
 import sys
 import os
-import shutil
+import time
+from functools import lru_cache
 from typing import Tuple, Optional
 
+from rich.color import Color, ColorParseError, ColorSystem
+
+from .utils import get_terminal_size
+
+
+# ============================================
+# STDOUT BUFFERING
+# A TTY stdout is already line-buffered. When piped/redirected (CI,
+# logs) Python block-buffers it, so small writes sit in the buffer
+# until an explicit flush - line buffering keeps output timely.
+# ============================================
+if not sys.stdout.isatty() and hasattr(sys.stdout, 'reconfigure'):
+    try:
+        sys.stdout.reconfigure(line_buffering=True)
+    except (ValueError, OSError):
+        pass
+
+
+def _write_raw(buf: bytes):
+    """
+    Write pre-encoded bytes straight to the stdout file descriptor.
+    
+    Bypasses the TextIOWrapper (locking, encoding, buffering) with
+    os.write, looping on partial writes. Pending text output is flushed
+    first so ordering is preserved. Falls back to a normal text write
+    when stdout has no real fd (e.g. pytest capture, Jupyter).
+    """
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        sys.stdout.write(buf.decode('ascii'))
+        sys.stdout.flush()
+        return
+    
+    sys.stdout.flush()
+    view = memoryview(buf)
+    while view:
+        try:
+            written = os.write(fd, view)
+        except InterruptedError:
+            continue
+        view = view[written:]
+
 
 def _enable_windows_ansi():
     """
@@ -63,6 +107,49 @@ def _enable_windows_ansi():
         return False
 
 
+# ============================================
+# COLOR SUPPORT - probed ONCE per process
+# The answer never changes while we run, so instead of checking
+# supports_color on every call, the module-level engine is either
+# the real engine or a no-op one.
+# ============================================
+_SUPPORTS_COLOR: bool = sys.stdout.isatty() and os.environ.get('TERM') != 'dumb'
+
+# Truecolor is only assumed when the terminal advertises it (COLORTERM,
+# or Windows Terminal). Otherwise backgrounds are sent as xterm-256
+# indexes: shorter escapes, and no silently dropped 24-bit codes.
+_TRUECOLOR: bool = (
+    os.environ.get('COLORTERM', '').lower() in ('truecolor', '24bit')
+    or 'WT_SESSION' in os.environ
+)
+
+def _to_xterm256(r: int, g: int, b: int) -> int:
+    """
+    xterm-256 index for an RGB color, picked by Rich's own downgrade so
+    the painted background matches cells Rich prints with bgcolor rgb(...)
+    """
+    return Color.from_rgb(r, g, b).downgrade(ColorSystem.EIGHT_BIT).number
+
+
+def _bg_sgr(r: int, g: int, b: int) -> str:
+    """Background SGR escape at the terminal's color depth"""
+    if _TRUECOLOR:
+        return f"\033[48;2;{r};{g};{b}m"
+    return f"\033[48;5;{_to_xterm256(r, g, b)}m"
+
+
+@lru_cache(maxsize=32)
+def _fg_sgr(color: str) -> str:
+    """Foreground SGR escape for a Rich color name/hex ("" if unparsable)"""
+    try:
+        r, g, b = Color.parse(color).get_truecolor()
+    except ColorParseError:
+        return ""
+    if _TRUECOLOR:
+        return f"\033[38;2;{r};{g};{b}m"
+    return f"\033[38;5;{_to_xterm256(r, g, b)}m"
+
+
 class ThemeEngine:
     """
     Global theme engine singleton.
@@ -103,25 +190,39 @@ class ThemeEngine:
         # ============================================
         # PERSISTENT STATE - survives all operations
         # ============================================
-        self.current_bg: Optional[Tuple[int, int, int]] = None  # RGB background
-        self.supports_color: bool = self._check_color_support()
-        self._initialized = True
-        
-    def _check_color_support(self) -> bool:
-        """
-        Check if terminal supports ANSI color codes.
-        
-        Modern terminals (Windows Terminal, VS Code, most Linux terminals)
-        support 24-bit TrueColor via the ANSI 48;2;R;G;B sequence.
-        """
-        # Check for terminal environment
-        if not sys.stdout.isatty():
-            return False
+        # current_bg is a property - setting it also rebuilds the
+        # cached ANSI code so callers never re-format it per print
+        self._current_bg: Optional[Tuple[int, int, int]] = None
+        self._bg_code: str = ""
+        self._bg_code_bytes: bytes = b""
         
-        # Most modern terminals support ANSI - return True by default
-        # Windows Terminal sets WT_SESSION env var
-        # COLORTERM=truecolor indicates 24-bit support
-        return True
+        # Full-viewport paint body, rebuilt only when the size changes
+        self._paint_template_key: Optional[Tuple[int, int]] = None
+        self._paint_template: bytes = b""
+        self._initialized = True
+    
+    # Set per class: the no-op engine below reports False
+    supports_color: bool = True
+    
+    @property
+    def current_bg(self) -> Optional[Tuple[int, int, int]]:
+        """Current background RGB (None when no theme applied)"""
+        return self._current_bg
+    
+    @current_bg.setter
+    def current_bg(self, rgb: Optional[Tuple[int, int, int]]):
+        if rgb is not None:
+            rgb = tuple(rgb)
+        if rgb == self._current_bg:
+            return
+        self._current_bg = rgb
+        if rgb is None:
+            self._bg_code = ""
+            self._bg_code_bytes = b""
+        else:
+            r, g, b = rgb
+            self._bg_code = _bg_sgr(r, g, b)
+            self._bg_code_bytes = self._bg_code.encode('ascii')
     
     def get_current_bg(self) -> Optional[Tuple[int, int, int]]:
         """
@@ -148,9 +249,6 @@ class ThemeEngine:
             theme: Optional theme object with .bg_rgb attribute. 
                    If None, uses self.current_bg.
         """
-        if not self.supports_color:
-            return
-
         # Determine RGB
         r, g, b = None, None, None
         if theme and hasattr(theme, 'bg_rgb'):
@@ -161,17 +259,12 @@ class ThemeEngine:
         if r is None:
             return  # No color to paint
 
-        # Save to state if it's new
+        # Save to state if it's new (rebuilds the cached code on change)
         self.current_bg = (r, g, b)
         
-        # Build ANSI Background Code
-        bg_code = f"\033[48;2;{r};{g};{b}m"
-        
         # Get dimensions
         try:
-            term_size = shutil.get_terminal_size()
-            width = term_size.columns
-            height = term_size.lines
+            width, height = get_terminal_size()
         except Exception:
             width = 120
             height = 30
@@ -182,38 +275,37 @@ class ThemeEngine:
         # 2. Clear screen (ESC[2J)
         # 3. Move cursor home (ESC[H)
         # ============================================
-        sys.stdout.write(bg_code)
-        sys.stdout.write("\033[3J")  # Clear scrollback buffer
-        sys.stdout.write("\033[2J")  # Clear visible viewport
-        sys.stdout.write("\033[H")   # Move cursor to top-left
+        buf = bytearray(self._bg_code_bytes)
+        buf += b"\033[3J\033[2J\033[H"
         
         # ============================================
         # MANDATORY STEP 2: TRUE FULL VIEWPORT PAINT
-        # Fill strictly (rows) lines with (columns) spaces
+        # Fill strictly (rows) lines with (columns) spaces.
+        # No newline after the last row to prevent auto-scroll.
+        # The prelude already set the background and SGR state persists
+        # across newlines, so rows are plain spaces - the body only
+        # depends on the size and is reused until the terminal resizes.
         # ============================================
-        blank_line = " " * width
+        key = (width, height)
+        if key != self._paint_template_key:
+            row = b" " * width
+            self._paint_template = (row + b"\n") * (height - 1) + row
+            self._paint_template_key = key
+        buf += self._paint_template
         
-        for row in range(height):
-            # Write background code explicit on every line
-            sys.stdout.write(f"{bg_code}{blank_line}")
-            
-            # Use \r\n to ensure we start at column 0 of next line
-            # But for the last line, we prevent auto-scroll if possible
-            if row < height - 1:
-                sys.stdout.write("\n")
-                
         # ============================================
-        # MANDATORY STEP 4: CURSOR POSITION CONTROL
-        # Move cursor back to safe UI start row (0,0) / Home
+        # MANDATORY STEP 3: CURSOR POSITION CONTROL
+        # Move cursor back to safe UI start row (0,0) / Home,
+        # then set the background for all future output
         # ============================================
-        sys.stdout.write("\033[H")
+        buf += b"\033[H"
+        buf += self._bg_code_bytes
         
-        # ============================================
-        # MANDATORY STEP 3: FORCE BACKGROUND ON EVERY PRINT
-        # Set background attribute strictly for future output
-        # ============================================
-        sys.stdout.write(bg_code)
-        sys.stdout.flush()
+        # The whole frame goes out in ONE write - each separate write
+        # is a round-trip through the console (ConPTY on Windows).
+        # Appending into one bytearray avoids the intermediate copies
+        # of chained bytes concatenation for large viewports.
+        _write_raw(buf)
 
     def apply_full_background(self, r: int = None, g: int = None, b: int = None):
         """
@@ -238,92 +330,111 @@ class ThemeEngine:
         """
         Re-apply the current background without full screen fill.
         """
-        if not self.supports_color or self.current_bg is None:
+        if self.current_bg is None:
             return
         
-        r, g, b = self.current_bg
-        bg_sequence = f"\033[48;2;{r};{g};{b}m"
-        sys.stdout.write(bg_sequence)
-        sys.stdout.flush()
+        _write_raw(self._bg_code_bytes)
 
     def ensure_background(self):
         """
         Ensure background color is active for subsequent output.
         """
-        if not self.supports_color or self.current_bg is None:
+        if self.current_bg is None:
             return
         
-        r, g, b = self.current_bg
         # FORCE background ANSI
-        sys.stdout.write(f"\033[48;2;{r};{g};{b}m")
-        sys.stdout.flush()
+        _write_raw(self._bg_code_bytes)
 
     def get_bg_ansi_code(self) -> str:
         """
         Get the ANSI escape sequence for current background.
         """
-        if self.current_bg is None:
-            return ""
-        r, g, b = self.current_bg
-        return f"\033[48;2;{r};{g};{b}m"
+        return self._bg_code
+
+    def get_fg_ansi_code(self, color: str) -> str:
+        """
+        Get the ANSI escape sequence for a text color (theme style color).
+        """
+        return _fg_sgr(color)
 
     def clear_screen_safe(self):
         """
         SAFE screen clear that preserves theme with FULL REPAINT.
         MUST Clear scrollback too.
         """
-        if not self.supports_color:
-            os.system('cls' if os.name == 'nt' else 'clear')
-            return
-        
         if self.current_bg is not None:
             self.paint_full_terminal_background()
         else:
-            sys.stdout.write("\033[3J\033[2J\033[H")
-            sys.stdout.flush()
+            _write_raw(b"\033[3J\033[2J\033[H")
 
     def reset_background(self):
         """
         Reset terminal to default colors.
         """
-        if not self.supports_color:
-            return
-        
-        sys.stdout.write("\033[0m")
-        sys.stdout.write("\033[3J\033[2J\033[H") # Clear scrollback + screen
-        sys.stdout.flush()
+        _write_raw(b"\033[0m\033[3J\033[2J\033[H")  # Reset + clear scrollback + screen
         self.current_bg = None
 
     def flash_background(self, r: int, g: int, b: int, duration: float = 0.1):
         """
-        Briefly flash background (uses partial repaint for speed if needed, 
-        but user requires full fill).
+        Briefly flash the background color.
+        
+        No per-cell fill needed: Erase in Display (ESC[2J) fills the
+        erased cells with the CURRENTLY set background, so a flash is
+        just SGR + ED, then the same with the saved color.
         """
-        import time
-        saved_bg = self.current_bg
-        self.apply_full_background(r, g, b)
+        _write_raw(f"{_bg_sgr(r, g, b)}\033[2J\033[H".encode('ascii'))
         time.sleep(duration)
-        if saved_bg:
-            self.apply_full_background(*saved_bg)
+        if self.current_bg is not None:
+            _write_raw(self._bg_code_bytes + b"\033[2J\033[H")
         else:
             self.reset_background()
 
 
+class NoopThemeEngine(ThemeEngine):
+    """
+    Theme engine for output that can't render color (pipes, CI logs,
+    TERM=dumb). Background state is still tracked so callers can query
+    it, but no escapes are ever written.
+    """
+    
+    supports_color: bool = False
+    
+    def paint_full_terminal_background(self, theme=None):
+        if theme is not None and hasattr(theme, 'bg_rgb'):
+            self.current_bg = theme.bg_rgb
+    
+    def repaint_background(self):
+        pass
+    
+    def ensure_background(self):
+        pass
+    
+    def get_bg_ansi_code(self) -> str:
+        return ""
+    
+    def get_fg_ansi_code(self, color: str) -> str:
+        return ""
+    
+    def clear_screen_safe(self):
+        # A pipe or dumb terminal has no screen to clear - no clear/cls
+        # process, just a line break between the old and new output
+        sys.stdout.write("\n")
+    
+    def reset_background(self):
+        pass
+    
+    def flash_background(self, r: int, g: int, b: int, duration: float = 0.1):
+        pass
+
+
 # ============================================
 # GLOBAL SINGLETON INSTANCE
 # ============================================
-# This ensures all modules share the same theme state
-_theme_engine_instance = None
+# Created once at import - all modules share the same theme state
+# by importing it directly: `from core.theme_engine import theme_engine`
+theme_engine: ThemeEngine = ThemeEngine() if _SUPPORTS_COLOR else NoopThemeEngine()
 
 
 def get_theme_engine() -> ThemeEngine:
-    """
-    Get the global ThemeEngine singleton.
-    
-    This is the ONLY way to access the theme engine.
-    Ensures single source of truth for theme state.
-    """
-    global _theme_engine_instance
-    if _theme_engine_instance is None:
-        _theme_engine_instance = ThemeEngine()
-    return _theme_engine_instance
+    """Get the global theme engine (kept for existing callers)"""
+    return theme_engine
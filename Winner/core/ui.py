@@ -5,11 +5,11 @@ Terminal UI components: panels, boxes, welcome screen.
 Uses Rich library for beautiful formatting.
 """
 
-import shutil
 import random
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, List
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.text import Text
 from rich.table import Table
@@ -17,8 +17,11 @@ from rich.columns import Columns
 from rich.align import Align
 from rich.box import ROUNDED, DOUBLE, HEAVY, SIMPLE
 from rich.style import Style
+from rich.cells import cell_len
 
 from .styles import get_style_manager
+from .theme_engine import theme_engine
+from .utils import get_terminal_size
 from .logos import get_logo, get_colored_logo, get_compact_logo
 
 
@@ -39,22 +42,44 @@ LOGO_SMALL = """
 """
 
 # Taglines
-TAGLINES = [
+TAGLINES = (
     "Your AI companion in the terminal ✨",
     "Where conversations come alive 💫",
     "Intelligence meets creativity 🧠",
     "Chat different. Chat NovaMind. 🚀",
     "A terminal that talks back 💬",
-]
+)
 
 # Startup tips
-TIPS = [
+TIPS = (
     "💡 Type /help to see all commands",
     "🎨 Try /theme hacker for Matrix vibes",
     "🎮 Type /play trivia to test your knowledge",
     "🔮 There are hidden easter eggs to discover!",
     "📌 Use /bookmark to save important moments",
-]
+)
+
+
+# Exit summary box: inner width in terminal cells between the ║ borders
+SUMMARY_INNER_WIDTH = 54
+
+
+def _summary_row(content: str, width: int = SUMMARY_INNER_WIDTH) -> str:
+    """Box row padded by terminal cells (emoji are 2 wide), not code points"""
+    return f"║{content}{' ' * max(0, width - cell_len(content))}║"
+
+
+@lru_cache(maxsize=4)
+def _greeting_for_hour(hour: int) -> str:
+    """Greeting text for an hour of the day (cached - the hour rarely changes)"""
+    if 5 <= hour < 12:
+        return "☀️ Good morning! Ready to start the day?"
+    elif 12 <= hour < 17:
+        return "🌤️ Good afternoon! Hope your day is going well!"
+    elif 17 <= hour < 21:
+        return "🌅 Good evening! What's on your mind?"
+    else:
+        return "🌙 Burning the midnight oil? I'm here for you!"
 
 
 class UI:
@@ -66,12 +91,22 @@ class UI:
     def __init__(self, console: Console):
         self.console = console
         self.style_manager = get_style_manager()
-        self.term_width = shutil.get_terminal_size().columns
+        self.term_width = get_terminal_size()[0]
         self.focus_mode = False
+        
+        # Rendered welcome frames keyed on everything that affects them
+        self._welcome_frames: dict = {}
+        # Background-aware welcome styles per (theme name, bg rgb)
+        self._style_cache: dict = {}
+        # Active output batch (see begin_batch / end_batch)
+        self._batch = None
+        # Tagline / tip rotation: random start, then cycle on each welcome
+        self._tag_idx = random.randrange(len(TAGLINES))
+        self._tip_idx = random.randrange(len(TIPS))
     
     def refresh_size(self):
         """Refresh terminal size"""
-        self.term_width = shutil.get_terminal_size().columns
+        self.term_width = get_terminal_size()[0]
     
     # ============================================
     # WELCOME SCREEN
@@ -87,14 +122,32 @@ class UI:
         theme = self.style_manager.theme
         current_theme_name = self.style_manager.current_theme_name
         
-        # FIX: Construct a style that includes the theme background
-        # This prevents Rich from resetting lines to default (black) background
-        # and creates a seamless "transparent" look
-        r, g, b = theme.bg_rgb
-        bg_rgb_str = f"rgb({r},{g},{b})"
-        
-        # Create styles that combine foreground colors with the theme background
-        base_style = Style(color=theme.primary, bgcolor=bg_rgb_str)
+        self._tag_idx = (self._tag_idx + 1) % len(TAGLINES)
+        self._tip_idx = (self._tip_idx + 1) % len(TIPS)
+        tagline = TAGLINES[self._tag_idx]
+        greeting = self._get_time_greeting()
+        tip = TIPS[self._tip_idx]
+        
+        # The screen was just cleared, so the whole frame is redrawn - but
+        # it is fully determined by these inputs. Reuse the rendered frame
+        # instead of re-running Rich's layout, and emit it in one write.
+        frame_key = (current_theme_name, self.term_width, tagline, greeting, tip)
+        frame = self._welcome_frames.get(frame_key)
+        if frame is None:
+            with self.console.capture() as capture:
+                self._render_welcome(theme, current_theme_name, tagline, greeting, tip)
+            frame = capture.get()
+            if len(self._welcome_frames) >= 32:
+                self._welcome_frames.clear()
+            self._welcome_frames[frame_key] = frame
+        
+        self.console.file.write(frame)
+        self.console.file.flush()
+    
+    def _render_welcome(self, theme, current_theme_name: str, tagline: str, greeting: str, tip: str):
+        """Print the welcome screen renderables (captured by show_welcome)"""
+        base_style, tagline_style, greeting_style, sep_style, bg_rgb_str = \
+            self._get_welcome_styles(theme, current_theme_name)
         
         # Get theme-specific logo
         if self.term_width >= 75:
@@ -102,26 +155,12 @@ class UI:
         else:
             logo = get_compact_logo(current_theme_name)
         
-        # Display theme-specific logo with background-aware style
+        # Theme-specific logo with background-aware style
         # We apply style to Align to ensure padding spaces also use the background
         logo_text = Text(logo, style=base_style)
-        self.console.print(Align.center(logo_text, style=base_style))
-        
-        # Tagline
-        tagline = random.choice(TAGLINES)
-        tagline_style = Style(color=theme.secondary, bgcolor=bg_rgb_str)
-        self.console.print(Align.center(Text(tagline, style=tagline_style), style=tagline_style))
-        self.console.print(Text(" ", style=base_style))
+        blank = Text(" ", style=base_style)
         
-        # Time-based greeting
-        greeting = self._get_time_greeting()
-        greeting_style = Style(color=theme.ai_text, bgcolor=bg_rgb_str)
-        self.console.print(Align.center(Text(greeting, style=greeting_style), style=greeting_style))
-        self.console.print(Text(" ", style=base_style))
-        
-        # Tip
-        tip = random.choice(TIPS)
-        # Use simple panel style string for background
+        # Tip - use simple panel style string for background
         panel_bg_style = f"on {bg_rgb_str}"
         tip_panel = Panel(
             Text(tip, style=theme.muted),
@@ -132,31 +171,46 @@ class UI:
             title_align="left",
             style=panel_bg_style # Applies background to panel
         )
-        self.console.print(Align.center(tip_panel, style=base_style))
-        self.console.print(Text(" ", style=base_style))
         
-        # Separator
-        sep_style = Style(color=theme.muted, bgcolor=bg_rgb_str)
-        self.console.print(
+        # One grouped print = one render pass and one write
+        self.console.print(Group(
+            Align.center(logo_text, style=base_style),
+            Align.center(Text(tagline, style=tagline_style), style=tagline_style),
+            blank,
+            Align.center(Text(greeting, style=greeting_style), style=greeting_style),
+            blank,
+            Align.center(tip_panel, style=base_style),
+            blank,
             Align.center(
                 Text("─" * min(50, self.term_width - 10), style=sep_style),
                 style=sep_style
+            ),
+            blank,
+        ))
+    
+    def _get_welcome_styles(self, theme, theme_name: str) -> tuple:
+        """Get (base, tagline, greeting, sep, bg_rgb_str) for a theme, cached"""
+        key = (theme_name, theme.bg_rgb)
+        styles = self._style_cache.get(key)
+        if styles is None:
+            # FIX: Construct styles that include the theme background
+            # This prevents Rich from resetting lines to default (black) background
+            # and creates a seamless "transparent" look
+            r, g, b = theme.bg_rgb
+            bg_rgb_str = f"rgb({r},{g},{b})"
+            styles = (
+                Style(color=theme.primary, bgcolor=bg_rgb_str),
+                Style(color=theme.secondary, bgcolor=bg_rgb_str),
+                Style(color=theme.ai_text, bgcolor=bg_rgb_str),
+                Style(color=theme.muted, bgcolor=bg_rgb_str),
+                bg_rgb_str,
             )
-        )
-        self.console.print(Text(" ", style=base_style))
+            self._style_cache[key] = styles
+        return styles
     
     def _get_time_greeting(self) -> str:
         """Get greeting based on current time"""
-        hour = datetime.now().hour
-        
-        if 5 <= hour < 12:
-            return "☀️ Good morning! Ready to start the day?"
-        elif 12 <= hour < 17:
-            return "🌤️ Good afternoon! Hope your day is going well!"
-        elif 17 <= hour < 21:
-            return "🌅 Good evening! What's on your mind?"
-        else:
-            return "🌙 Burning the midnight oil? I'm here for you!"
+        return _greeting_for_hour(datetime.now().hour)
     
     # ============================================
     # MESSAGE DISPLAY
@@ -347,12 +401,8 @@ Made with ❤️ for the terminal lovers.
         """Display beautiful exit summary"""
         theme = self.style_manager.theme
         
-        lines = [
-            "",
-            "╔══════════════════════════════════════════════════════╗",
-            "║              ✨ SESSION COMPLETE ✨                  ║",
-            "╠══════════════════════════════════════════════════════╣",
-        ]
+        border = "═" * SUMMARY_INNER_WIDTH
+        separator = f"╠{border}╣"
         
         # Stats - using proper string formatting
         msg_count = str(stats.get('messages', 0))
@@ -360,30 +410,36 @@ Made with ❤️ for the terminal lovers.
         words = f"{stats.get('words', 0):,}"
         ach_count = str(stats.get('achievements', 0))
         
-        lines.append(f"║  📊 Messages Exchanged: {msg_count:<26}║")
-        lines.append(f"║  ⏱️  Session Duration: {duration:<27}║")
-        lines.append(f"║  💬 Words Spoken: {words:<33}║")
-        lines.append(f"║  🏆 Achievements Unlocked: {ach_count:<24}║")
+        lines = [
+            "",
+            f"╔{border}╗",
+            _summary_row("              ✨ SESSION COMPLETE ✨"),
+            separator,
+            _summary_row(f"  📊 Messages Exchanged: {msg_count}"),
+            _summary_row(f"  ⏱️  Session Duration: {duration}"),
+            _summary_row(f"  💬 Words Spoken: {words}"),
+            _summary_row(f"  🏆 Achievements Unlocked: {ach_count}"),
+        ]
         
         if mood_journey:
-            lines.append("╠══════════════════════════════════════════════════════╣")
-            lines.append(f"║  💫 Mood Journey: {mood_journey:<33}║")
+            lines.append(separator)
+            lines.append(_summary_row(f"  💫 Mood Journey: {mood_journey}"))
         
         memorable = stats.get('memorable_moment')
         if memorable:
-            lines.append("╠══════════════════════════════════════════════════════╣")
-            lines.append("║  🌟 Memorable Moment:                                ║")
+            lines.append(separator)
+            lines.append(_summary_row("  🌟 Memorable Moment:"))
             # Wrap memorable moment to fit
             wrapped = memorable[:45] + "..."
-            lines.append(f"║  {wrapped:<50}║")
+            lines.append(_summary_row(f"  {wrapped}"))
         
-        lines.append("╚══════════════════════════════════════════════════════╝")
+        lines.append(f"╚{border}╝")
         lines.append("")
         lines.append("        Thanks for chatting! See you soon! 👋")
         lines.append("")
         
-        for line in lines:
-            self.console.print(Text(line, style=theme.primary))
+        # Single render instead of one print per line
+        self.console.print(Text("\n".join(lines), style=theme.primary))
     
     # ============================================
     # INPUT PROMPT
@@ -416,8 +472,29 @@ Made with ❤️ for the terminal lovers.
     def clear(self):
         """Clear the terminal while preserving theme"""
         # CRITICAL: Use theme engine's safe clear to preserve background color
-        from .theme_engine import get_theme_engine
-        get_theme_engine().clear_screen_safe()
+        theme_engine.clear_screen_safe()
+    
+    def begin_batch(self):
+        """
+        Start collecting console output instead of writing it.
+        
+        Everything printed through the console until end_batch() is
+        rendered into memory and written out in ONE write + flush,
+        rather than one flush per panel.
+        """
+        if self._batch is not None:
+            return
+        self._batch = self.console.capture()
+        self._batch.__enter__()
+    
+    def end_batch(self):
+        """Write out everything collected since begin_batch()"""
+        if self._batch is None:
+            return
+        batch, self._batch = self._batch, None
+        batch.__exit__(None, None, None)
+        self.console.file.write(batch.get())
+        self.console.file.flush()
     
     def set_focus_mode(self, enabled: bool):
         """Set focus mode"""
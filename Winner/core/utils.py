@@ -7,17 +7,68 @@ Helper functions and shared utilities.
 import os
 import sys
 import shutil
+import signal
+import time
 import json
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
 from datetime import datetime
 from typing import Optional
 
 
+# ============================================
+# TERMINAL SIZE CACHE
+# shutil.get_terminal_size() is a syscall + env lookup. The cached
+# value is dropped on SIGWINCH (POSIX); platforms without SIGWINCH
+# re-query once the TTL has expired.
+# ============================================
+_TERM_SIZE_TTL = 1.0
+_cached_size: Optional[tuple] = None
+_size_checked_at = 0.0
+
+
+def _invalidate_terminal_size():
+    global _cached_size
+    _cached_size = None
+
+
+def _install_resize_handler() -> bool:
+    """Invalidate the cached size on SIGWINCH, chaining any existing handler"""
+    if not hasattr(signal, 'SIGWINCH'):
+        return False
+    try:
+        previous = signal.getsignal(signal.SIGWINCH)
+        
+        def _on_resize(signum, frame):
+            _invalidate_terminal_size()
+            if callable(previous):
+                previous(signum, frame)
+        
+        signal.signal(signal.SIGWINCH, _on_resize)
+        return True
+    except (ValueError, OSError):
+        # Not on the main thread - fall back to the TTL
+        return False
+
+
+_HAS_RESIZE_SIGNAL = _install_resize_handler()
+
+
 def get_terminal_size() -> tuple:
-    """Get terminal width and height"""
-    size = shutil.get_terminal_size()
-    return size.columns, size.lines
+    """Get terminal width and height (cached until the terminal resizes)"""
+    global _cached_size, _size_checked_at
+    if _cached_size is None or (
+        not _HAS_RESIZE_SIGNAL and time.monotonic() - _size_checked_at >= _TERM_SIZE_TTL
+    ):
+        size = shutil.get_terminal_size()
+        _cached_size = (size.columns, size.lines)
+        _size_checked_at = time.monotonic()
+    return _cached_size
 
 
+@lru_cache(maxsize=1)
 def is_emoji_supported() -> bool:
     """Check if terminal likely supports emoji"""
     # Windows Terminal and modern terminals support emoji
@@ -41,49 +92,65 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
     """Truncate text to max length with suffix"""
     if len(text) <= max_length:
         return text
+    return _truncate(text, max_length, suffix)
+
+
+@lru_cache(maxsize=1024)
+def _truncate(text: str, max_length: int, suffix: str) -> str:
+    # Labels (menu items, achievement names) repeat every frame
     return text[:max_length - len(suffix)] + suffix
 
 
 def wrap_text(text: str, width: int) -> list:
     """Wrap text to specified width"""
     words = text.split()
+    # prefix[i] = width of words[:i + 1] joined, plus one trailing space
+    prefix = list(accumulate(len(word) + 1 for word in words))
     lines = []
-    current_line = []
-    current_length = 0
-    
-    for word in words:
-        if current_length + len(word) + 1 <= width:
-            current_line.append(word)
-            current_length += len(word) + 1
-        else:
-            if current_line:
-                lines.append(" ".join(current_line))
-            current_line = [word]
-            current_length = len(word)
     
-    if current_line:
-        lines.append(" ".join(current_line))
+    start = 0
+    while start < len(words):
+        # Last word that still fits: joined width <= width
+        before = prefix[start - 1] if start else 0
+        end = bisect_right(prefix, before + width + 1, start)
+        end = max(end, start + 1)  # an over-long word gets its own line
+        lines.append(" ".join(words[start:end]))
+        start = end
     
     return lines
 
 
 def format_timestamp(timestamp: float) -> str:
     """Format timestamp to readable string"""
-    dt = datetime.fromtimestamp(timestamp)
-    return dt.strftime("%H:%M")
+    return _format_hm(int(timestamp))
 
 
 def format_date(timestamp: float) -> str:
     """Format timestamp to date string"""
-    dt = datetime.fromtimestamp(timestamp)
-    return dt.strftime("%Y-%m-%d %H:%M")
+    return _format_ymd_hm(int(timestamp))
+
+
+# Scrollback re-renders format the same timestamps over and over;
+# keyed on whole seconds (the formats have minute resolution)
+@lru_cache(maxsize=4096)
+def _format_hm(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds).strftime("%H:%M")
+
+
+@lru_cache(maxsize=4096)
+def _format_ymd_hm(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds).strftime("%Y-%m-%d %H:%M")
+
+
+# Write buffer for exports (1 MiB): large transcripts go out in few syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
 
 
 def save_to_file(content: str, filename: str, directory: str = ".") -> bool:
     """Save content to file"""
     try:
         filepath = os.path.join(directory, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
+        with open(filepath, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
             f.write(content)
         return True
     except Exception:
@@ -94,13 +161,19 @@ def save_json(data: dict, filename: str, directory: str = ".") -> bool:
     """Save data as JSON file"""
     try:
         filepath = os.path.join(directory, filename)
+        # Encode up front and write once - json.dump issues a write per chunk
+        payload = json.dumps(data, indent=2, ensure_ascii=False)
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write(payload)
         return True
     except Exception:
         return False
 
 
+# KEY=value lines; blank lines and # comments never match
+_ENV_LINE_RE = re.compile(r'^[ \t]*([^#=\s][^=\n]*)=(.*)$', re.MULTILINE)
+
+
 def load_env_file(filepath: str = ".env") -> dict:
     """Load environment variables from .env file"""
     env_vars = {}
@@ -110,12 +183,12 @@ def load_env_file(filepath: str = ".env") -> dict:
     
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key.strip()] = value.strip()
-                    os.environ[key.strip()] = value.strip()
+            data = f.read()
+        env_vars = {
+            match.group(1).strip(): match.group(2).strip()
+            for match in _ENV_LINE_RE.finditer(data)
+        }
+        os.environ.update(env_vars)
     except Exception:
         pass
     
@@ -124,32 +197,35 @@ def load_env_file(filepath: str = ".env") -> dict:
 
 def clear_screen():
     """Clear the terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if os.environ.get('TERM') == 'dumb':
+        os.system('cls' if os.name == 'nt' else 'clear')
+        return
+    # Home + clear screen + clear scrollback, without spawning a process
+    sys.stdout.write('\033[H\033[2J\033[3J')
+    sys.stdout.flush()
+
+
+# Leading question words; str.startswith tests the whole tuple in one call
+_QUESTION_PREFIXES = tuple(
+    word + ' '
+    for word in ('what', 'why', 'how', 'when', 'where', 'who', 'which', 'whose', 'whom')
+)
 
 
 def is_question(text: str) -> bool:
     """Check if text is a question"""
-    question_words = ['what', 'why', 'how', 'when', 'where', 'who', 'which', 'whose', 'whom']
     text_lower = text.lower().strip()
-    
-    if text_lower.endswith('?'):
-        return True
-    
-    for word in question_words:
-        if text_lower.startswith(word + ' '):
-            return True
-    
-    return False
+    return text_lower.endswith('?') or text_lower.startswith(_QUESTION_PREFIXES)
+
+
+# Control characters dropped by sanitize_input (0-31 except newline, and DEL)
+_SANITIZE_TABLE = dict.fromkeys([i for i in range(32) if i != 10] + [127])
 
 
 def sanitize_input(text: str) -> str:
     """Sanitize user input"""
     # Remove control characters but keep newlines
-    cleaned = ''.join(
-        char for char in text 
-        if char == '\n' or (ord(char) >= 32 and ord(char) < 127) or ord(char) > 127
-    )
-    return cleaned.strip()
+    return text.translate(_SANITIZE_TABLE).strip()
 
 
 class Colors:
@@ -177,9 +253,15 @@ class Colors:
     BRIGHT_WHITE = '\033[97m'
 
 
+@lru_cache(maxsize=1)
+def _exports_path() -> str:
+    # Resolved once per session; the directory itself is checked per call
+    return os.path.abspath("exports")
+
+
 def get_exports_directory() -> str:
     """Get or create exports directory"""
-    exports_dir = os.path.join(os.getcwd(), "exports")
-    if not os.path.exists(exports_dir):
-        os.makedirs(exports_dir)
+    exports_dir = _exports_path()
+    # Recreated if it was removed during the session
+    os.makedirs(exports_dir, exist_ok=True)
     return exports_dir
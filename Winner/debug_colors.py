@@ -2,29 +2,29 @@ import sys
 import os
 from rich.style import Style as RichStyle
 
-# Add current dir to path
-sys.path.insert(0, os.getcwd())
-
-from core.styles import THEMES, ThemeColors
+# Theme color fields to validate
+_FIELDS = (
+    "primary",
+    "secondary",
+    "user_text",
+    "ai_text",
+    "system_text",
+    "error_text",
+    "border",
+    "highlight",
+    "muted",
+)
 
 def test_themes():
+    from core.styles import THEMES
+
     # Only test light
     name = "light"
     theme = THEMES[name]
     print(f"Testing theme: {name}")
-    fields = [
-        ("primary", theme.primary),
-        ("secondary", theme.secondary),
-        ("user_text", theme.user_text),
-        ("ai_text", theme.ai_text),
-        ("system_text", theme.system_text),
-        ("error_text", theme.error_text),
-        ("border", theme.border),
-        ("highlight", theme.highlight),
-        ("muted", theme.muted),
-    ]
     
-    for field, color in fields:
+    for field in _FIELDS:
+        color = getattr(theme, field)
         print(f"  Checking {field}: repr={repr(color)}")
         try:
             s = RichStyle(color=color)
@@ -33,4 +33,6 @@ def test_themes():
             print(f"    -> ERROR: {e}")
 
 if __name__ == "__main__":
+    # Add current dir to path
+    sys.path.insert(0, os.getcwd())
     test_themes()
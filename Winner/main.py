@@ -20,9 +20,14 @@ Version: 1.0.0
 
 import sys
 import os
+import re
 import time
+import select
 import signal
+import threading
+from concurrent.futures import Future, wait
 from datetime import datetime
+from itertools import chain
 
 # ============================================
 # WINDOWS UNICODE FIX
@@ -39,8 +44,18 @@ if sys.platform == 'win32':
         sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
         sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
     
-    # Enable ANSI escape sequences on Windows
-    os.system('')
+    # Enable ANSI escape sequences on Windows: set
+    # ENABLE_VIRTUAL_TERMINAL_PROCESSING on the console directly
+    # instead of spawning cmd.exe via os.system('')
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_ulong()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+    except (ImportError, AttributeError, OSError):
+        os.system('')
 
 # Set environment variable for Rich library
 os.environ['PYTHONIOENCODING'] = 'utf-8'
@@ -56,10 +71,12 @@ load_dotenv()
 from rich.console import Console
 from rich.text import Text
 from rich.live import Live
+from rich.align import Align
+from rich.style import Style as RichStyle
 
 # Core modules
 from core.styles import get_style_manager, THEMES
-from core.theme_engine import get_theme_engine
+from core.theme_engine import theme_engine
 from core.animator import Animator
 from core.ui import UI
 from core.ai_engine import get_ai_engine
@@ -73,7 +90,131 @@ from core.easter_eggs import (
     get_random_fortune, 
     get_8ball_response
 )
-from core.utils import is_question, sanitize_input
+from core.logos import get_logo, get_compact_logo
+from core.sanitizer import sanitize_output
+from core.sounds import get_sound_simulator
+from core.text_renderer import prepare_response_for_box, stream_box_lines, visible_width
+from core.utils import (
+    is_question,
+    sanitize_input,
+    get_terminal_size,
+    save_to_file,
+    save_json,
+    get_exports_directory,
+)
+
+
+# Status line shown above the input prompt (messages, achievements, theme)
+STATUS_TEMPLATE = "  💬 {} | 🏆 {} | 🎨 {}"
+
+# Upper bound for a reply's typing animation, in seconds
+MAX_TYPING_SECONDS = 2.0
+
+# Typing delay per character (seconds, before the mood speed modifier):
+# pauses after sentence ends and clause breaks, quick spaces
+CHAR_DELAYS = {
+    **dict.fromkeys(".!?", 0.08),
+    **dict.fromkeys(",;:", 0.04),
+    " ": 0.01,
+}
+DEFAULT_CHAR_DELAY = 0.02
+
+# Typing animation chunks: an ANSI escape code (group 1), or a run of
+# text up to and including the next space / punctuation mark
+TYPING_CHUNK_PATTERN = re.compile(r'(\x1b(?:\[[0-9;]*m)?)|[^\x1b .!?,;:]*[ .!?,;:]?')
+
+
+def _typing_writer():
+    """
+    (write, flush) pair for the typing animation.
+    
+    On POSIX the text is collected and each flush is a single os.write
+    on the stdout fd, skipping the TextIOWrapper/BufferedWriter layers.
+    Windows (console needs the wrapper) and fd-less streams use stdout.
+    """
+    if sys.platform == 'win32':
+        return sys.stdout.write, sys.stdout.flush
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        return sys.stdout.write, sys.stdout.flush
+    
+    encoding = sys.stdout.encoding or 'utf-8'
+    pending = []
+    sys.stdout.flush()  # keep ordering with earlier buffered output
+    
+    def flush():
+        if not pending:
+            return
+        view = memoryview("".join(pending).encode(encoding, 'replace'))
+        pending.clear()
+        while view:
+            try:
+                written = os.write(fd, view)
+            except InterruptedError:
+                continue
+            view = view[written:]
+    
+    return pending.append, flush
+
+
+def _input_pending() -> bool:
+    """
+    True if keystrokes are waiting on stdin (never blocks).
+    
+    POSIX uses select with a zero timeout (in canonical tty mode that
+    means a typed line), Windows msvcrt.kbhit. Non-tty stdin is ignored
+    since a pipe or file always reads as ready.
+    """
+    try:
+        if not sys.stdin.isatty():
+            return False
+        if sys.platform == 'win32':
+            import msvcrt
+            return bool(msvcrt.kbhit())
+        return bool(select.select([sys.stdin], [], [], 0)[0])
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _run_in_background(fn, *args) -> Future:
+    """
+    Run fn(*args) on a daemon thread; the result (or exception) lands in
+    the returned Future. Daemon, so a request still pending on exit
+    (up to its 60s timeout) never holds up interpreter shutdown.
+    """
+    future = Future()
+    
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+    
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def _typing_chunks(line: str):
+    """
+    Split a wrapped line into typing steps: (chunk, base delay) pairs.
+    
+    ANSI escape codes come with a None delay - they go out with the next
+    visible chunk instead of being animated.
+    """
+    delay_get = CHAR_DELAYS.get
+    for match in TYPING_CHUNK_PATTERN.finditer(line):
+        chunk = match.group()
+        if not chunk:
+            continue
+        if match.lastindex == 1:
+            yield chunk, None
+        else:
+            yield chunk, sum(delay_get(char, DEFAULT_CHAR_DELAY) for char in chunk)
 
 
 class NovaMind:
@@ -85,7 +226,7 @@ class NovaMind:
     def __init__(self):
         # Initialize console with theme
         self.style_manager = get_style_manager()
-        self.theme_engine = get_theme_engine()
+        self.theme_engine = theme_engine
         self.console = Console(theme=self.style_manager.rich_theme)
         
         # Initialize components
@@ -97,6 +238,7 @@ class NovaMind:
         self.commands = get_command_parser()
         self.achievements = get_achievement_tracker()
         self.eggs = get_easter_egg_hunter()
+        self.sound = get_sound_simulator()
         
         # State
         self.running = True
@@ -106,16 +248,50 @@ class NovaMind:
         # Loop Safety Guards
         self.response_rendered = False
         
-        # Setup signal handlers for graceful exit
-        signal.signal(signal.SIGINT, self._handle_interrupt)
+        # Slash command name -> handler (see COMMAND HANDLING)
+        self._command_handlers = {
+            "exit": self._cmd_exit,
+            "quit": self._cmd_exit,
+            "help": self._cmd_help,
+            "clear": self._cmd_clear,
+            "reset": self._cmd_reset,
+            "theme": self._cmd_theme,
+            "mode": self._cmd_mode,
+            "stats": self._cmd_stats,
+            "achievements": self._cmd_achievements,
+            "ach": self._cmd_achievements,
+            "sound": self._cmd_sound,
+            "focus": self._cmd_focus,
+            "export": self._cmd_export,
+            "play": self._cmd_play,
+            "name": self._cmd_name,
+            "bookmark": self._cmd_bookmark,
+            "bookmarks": self._cmd_bookmarks,
+            "about": self._cmd_about,
+            "hint": self._cmd_hint,
+        }
+        
+        # Achievement context gathered during a turn (see _flush_achievements)
+        self._pending_ach_context: dict = {}
+        
+        # Background last painted by _apply_current_theme_bg
+        self._last_applied_bg = None
+        
+        # Ctrl+C arrives as KeyboardInterrupt in _main_loop; SIGTERM is
+        # turned into one too, so it takes the same exit path. No console
+        # output inside the signal handler, which could interrupt Rich
+        # mid-write.
         if hasattr(signal, 'SIGTERM'):
-            signal.signal(signal.SIGTERM, self._handle_interrupt)
+            signal.signal(signal.SIGTERM, self._handle_terminate)
     
-    def _handle_interrupt(self, signum, frame):
-        """Handle Ctrl+C gracefully"""
-        self.console.print("\n")
-        self.exit_gracefully()
-        sys.exit(0)
+    def _handle_terminate(self, signum, frame):
+        """
+        Stop on SIGTERM by raising KeyboardInterrupt in the main thread.
+        Just clearing self.running is not enough: a blocked input() is
+        retried after the handler returns (PEP 475).
+        """
+        self.running = False
+        raise KeyboardInterrupt
     
     # ============================================
     # STARTUP
@@ -164,12 +340,16 @@ class NovaMind:
                 # Process input
                 self._process_input(user_input)
                 
+                # One achievement check for everything this turn did
+                self._flush_achievements()
+                
             except EOFError:
                 # Ctrl+D
                 self.exit_gracefully()
                 break
             except KeyboardInterrupt:
-                # Ctrl+C (backup handler)
+                # Ctrl+C
+                self.console.print("\n")
                 self.exit_gracefully()
                 break
             except Exception as e:
@@ -182,13 +362,18 @@ class NovaMind:
     def _get_input(self) -> str:
         """Get user input with styled prompt"""
         theme = self.style_manager.theme
-        stats = self.memory.get_session_summary()
         ach_display = self.achievements.get_progress()
         
-        # Show subtle status
-        self.console.print()
-        status = f"  💬 {stats['messages']} | 🏆 {ach_display} | 🎨 {self.memory.current_theme}"
-        self.console.print(Text(status, style=theme.muted))
+        # Show subtle status - one plain write with the cached muted color
+        # escape; 39m resets only the foreground so the theme bg stays
+        status = STATUS_TEMPLATE.format(
+            self.memory.message_count, ach_display, self.memory.current_theme
+        )
+        muted = self.theme_engine.get_fg_ansi_code(theme.muted)
+        if muted:
+            sys.stdout.write(f"\n{muted}{status}\033[39m\n")
+        else:
+            sys.stdout.write(f"\n{status}\n")
         
         # Input prompt
         try:
@@ -205,9 +390,6 @@ class NovaMind:
             self.ui.show_system_message("Say something! I'm listening... 👂")
             return
         
-        # Track time for achievements
-        self._last_message_time = time.time()
-        
         # Check if it's a command
         if self.commands.is_command(user_input):
             cmd, args = self.commands.parse(user_input)
@@ -233,196 +415,209 @@ class NovaMind:
         self.memory.record_command()
         
         # Check achievements
-        self._check_achievements({"command": cmd})
+        self._queue_achievements({"command": cmd})
         
-        if cmd in ["exit", "quit"]:
-            self.exit_gracefully()
-            self.running = False
+        handler = self._command_handlers.get(cmd)
+        if handler is None:
+            self.ui.show_error(f"Unknown command: /{cmd}. Try /help")
             return
-        
-        elif cmd == "help":
-            help_text = self.commands.get_help_text()
-            self.ui.show_help(help_text)
-        
-        elif cmd == "clear":
-            # CRITICAL FIX: Use theme-safe clear that preserves background
-            self.theme_engine.clear_screen_safe()
-            self.ui.show_welcome(animate=False)
-            # Re-apply theme background after welcome screen
-            self._apply_current_theme_bg()
-            # Ensure background is active for subsequent output
-            self.theme_engine.ensure_background()
-        
-        elif cmd == "reset":
-            self.memory.clear()
-            self.ui.show_success("Conversation reset! Fresh start. 🌟")
-        
-        elif cmd == "theme":
-            if args:
-                target = args[0].lower()
-                theme_names = self.style_manager.get_theme_names()
-                selected_name = None
+        handler(args)
+    
+    def _cmd_exit(self, args: list):
+        """/exit, /quit - show the summary and stop"""
+        # The loop ends after this turn - award before the summary
+        self._flush_achievements()
+        self.exit_gracefully()
+        self.running = False
+    
+    def _cmd_help(self, args: list):
+        """/help"""
+        help_text = self.commands.get_help_text()
+        self.ui.show_help(help_text)
+    
+    def _cmd_clear(self, args: list):
+        """/clear - clear the screen and redraw the welcome"""
+        # CRITICAL FIX: Use theme-safe clear that preserves background
+        self.theme_engine.clear_screen_safe()
+        self.ui.show_welcome(animate=False)
+        # Re-apply theme background after welcome screen
+        self._apply_current_theme_bg(force=True)
+        # Ensure background is active for subsequent output
+        self.theme_engine.ensure_background()
+    
+    def _cmd_reset(self, args: list):
+        """/reset - forget the conversation"""
+        self.memory.clear()
+        self.ui.show_success("Conversation reset! Fresh start. 🌟")
+    
+    def _cmd_theme(self, args: list):
+        """/theme [name|number] - switch theme, or list them"""
+        if args:
+            target = args[0].lower()
+            theme_names = self.style_manager.get_theme_names()
+            selected_name = None
+            
+            # Handle numeric selection
+            if target.isdigit():
+                idx = int(target) - 1
+                if 0 <= idx < len(theme_names):
+                    selected_name = theme_names[idx]
+            elif target in theme_names:
+                selected_name = target
                 
-                # Handle numeric selection
-                if target.isdigit():
-                    idx = int(target) - 1
-                    if 0 <= idx < len(theme_names):
-                        selected_name = theme_names[idx]
-                elif target in theme_names:
-                    selected_name = target
-                    
-                if selected_name and self.style_manager.switch_theme(selected_name):
-                    self.memory.set_theme(selected_name)
-                    
-                    # ============================================
-                    # CRITICAL FIX: DO NOT recreate Console/UI/Animator
-                    # Console recreation causes complete state loss and
-                    # triggers rendering bugs including token leaks.
-                    # 
-                    # Instead, we ONLY apply the new theme background.
-                    # The style_manager already updated, so Rich will
-                    # use new colors on subsequent prints.
-                    # ============================================
-                    
-                    # Apply theme background - this clears screen and applies new colors
-                    self._apply_current_theme_bg()
-                    
-                    # Re-apply background after any potential reset
-                    self.theme_engine.ensure_background()
-                    
-                    # Show success message AFTER theme is applied
-                    self.ui.show_success(f"Theme changed to {selected_name} {self.style_manager.theme.emoji}")
-
-                    # Display the new theme's logo
-                    from core.logos import get_logo, get_compact_logo
-                    import shutil
-
-                    term_width = shutil.get_terminal_size().columns
-                    if term_width >= 75:
-                        logo = get_logo(selected_name)
-                    else:
-                        logo = get_compact_logo(selected_name)
-                    
-                    from rich.align import Align
-                    self.console.print(Align.center(Text(logo, style=self.style_manager.theme.primary)))
-                    self.console.print()
-                    self._check_achievements({"current_theme": selected_name, "themes_used": self.memory.stats.themes_used})
-                else:
-                    self.ui.show_error(f"Unknown theme. Use /theme to list available options.")
-            else:
-                self.console.print("\n🎨 Available Themes:", style="bold")
-                self.console.print("Type /theme <name> or /theme <number> to switch.\n")
+            if selected_name and self.style_manager.switch_theme(selected_name):
+                self.memory.set_theme(selected_name)
                 
-                # Show preview list with real colors
-                from rich.style import Style as RichStyle
+                # ============================================
+                # CRITICAL FIX: DO NOT recreate Console/UI/Animator
+                # Console recreation causes complete state loss and
+                # triggers rendering bugs including token leaks.
+                # 
+                # Instead, we ONLY apply the new theme background.
+                # The style_manager already updated, so Rich will
+                # use new colors on subsequent prints.
+                # ============================================
                 
-                for idx, name in enumerate(self.style_manager.get_theme_names(), 1):
-                    t = THEMES[name]
-                    # Create a preview block with the theme's background color
-                    # We use the RGB values to create a rich style
-                    r, g, b = t.bg_rgb
-                    preview_style = RichStyle(bgcolor=f"rgb({r},{g},{b})", color=t.user_text)
-                    
-                    self.console.print(f"  {idx}. ", end="")
-                    self.console.print(f" {t.emoji} {t.name:<20} ", style=preview_style)
-                self.console.print()
-        
-        elif cmd == "mode":
-            if args:
-                mode_name = args[0].lower()
-                if self.ai.set_mode(mode_name):
-                    self.memory.set_mode(mode_name)
-                    self.ui.show_success(f"Mode set to {mode_name} ✨")
-                else:
-                    self.ui.show_error(f"Unknown mode. Try: {', '.join(self.ai.get_available_modes())}")
-            else:
-                self.console.print("Available modes:")
-                self.console.print(self.commands.get_mode_list())
-        
-        elif cmd == "stats":
-            stats = self.memory.get_session_summary()
-            self.ui.show_stats(stats)
-        
-        elif cmd in ["achievements", "ach"]:
-            unlocked = self.achievements.get_unlocked()
-            locked = self.achievements.get_locked()
-            progress = self.achievements.get_progress()
-            self.ui.show_achievements(unlocked, locked, progress)
-        
-        elif cmd == "sound":
-            if args and args[0].lower() in ["on", "off"]:
-                enabled = args[0].lower() == "on"
-                self.animator.set_sound(enabled)
+                # Apply theme background - this clears screen and applies new colors
+                self._apply_current_theme_bg()
                 
-                # Also update global sound engine
-                from core.sounds import get_sound_simulator
-                sim = get_sound_simulator()
-                sim.set_enabled(enabled)
+                # Re-apply background after any potential reset
+                self.theme_engine.ensure_background()
                 
-                if enabled:
-                    sim.play_notification_sound()
+                # Show success message AFTER theme is applied
+                self.ui.show_success(f"Theme changed to {selected_name} {self.style_manager.theme.emoji}")
+
+                # Display the new theme's logo
+                term_width = get_terminal_size()[0]
+                if term_width >= 75:
+                    logo = get_logo(selected_name)
+                else:
+                    logo = get_compact_logo(selected_name)
                 
-                self.ui.show_success(f"Sound effects {'enabled' if enabled else 'disabled'}")
-            else:
-                self.ui.show_system_message("Usage: /sound on|off")
-        
-        elif cmd == "focus":
-            if args and args[0].lower() in ["on", "off"]:
-                enabled = args[0].lower() == "on"
-                self.focus_mode = enabled
-                self.animator.set_focus_mode(enabled)
-                self.ui.show_success(f"Focus mode {'enabled' if enabled else 'disabled'}")
-            else:
-                self.ui.show_system_message("Usage: /focus on|off")
-        
-        elif cmd == "export":
-            if args:
-                format_type = args[0].lower()
-                self._export_chat(format_type)
-            else:
-                self.ui.show_system_message("Usage: /export txt|md|json")
-        
-        elif cmd == "play":
-            if args:
-                game = args[0].lower()
-                self._play_game(game)
-            else:
-                self.console.print("Available games:")
-                self.console.print(self.commands.get_game_list())
-        
-        elif cmd == "name":
-            if args:
-                name = " ".join(args)
-                self.memory.set_user_name(name)
-                self.ui.show_success(f"Nice to meet you, {name}! 👋")
-            else:
-                self.ui.show_system_message("Usage: /name <your_name>")
-        
-        elif cmd == "bookmark":
-            if self.memory.add_bookmark():
-                self.ui.show_success("Bookmark saved! 📌")
-                self._check_achievements({"bookmark_count": len(self.memory.bookmarks)})
+                self.console.print(Align.center(Text(logo, style=self.style_manager.theme.primary)))
+                self.console.print()
+                self._queue_achievements({"current_theme": selected_name, "themes_used": self.memory.stats.themes_used})
             else:
-                self.ui.show_error("Nothing to bookmark yet!")
-        
-        elif cmd == "bookmarks":
-            bookmarks = self.memory.get_bookmarks()
-            if bookmarks:
-                self.console.print("\n📚 Your Bookmarks:")
-                for i, bm in enumerate(bookmarks, 1):
-                    self.console.print(f"  {i}. {bm.message_preview}")
+                self.ui.show_error(f"Unknown theme. Use /theme to list available options.")
+        else:
+            self.console.print("\n🎨 Available Themes:", style="bold")
+            self.console.print("Type /theme <name> or /theme <number> to switch.\n")
+            
+            # Show preview list with real colors
+            for idx, name in enumerate(self.style_manager.get_theme_names(), 1):
+                t = THEMES[name]
+                # Create a preview block with the theme's background color
+                # We use the RGB values to create a rich style
+                r, g, b = t.bg_rgb
+                preview_style = RichStyle(bgcolor=f"rgb({r},{g},{b})", color=t.user_text)
+                
+                self.console.print(f"  {idx}. ", end="")
+                self.console.print(f" {t.emoji} {t.name:<20} ", style=preview_style)
+            self.console.print()
+    
+    def _cmd_mode(self, args: list):
+        """/mode [name] - switch AI mode, or list them"""
+        if args:
+            mode_name = args[0].lower()
+            if self.ai.set_mode(mode_name):
+                self.memory.set_mode(mode_name)
+                self.ui.show_success(f"Mode set to {mode_name} ✨")
             else:
-                self.ui.show_system_message("No bookmarks yet. Use /bookmark to save a moment!")
-        
-        elif cmd == "about":
-            self.ui.show_about()
-        
-        elif cmd == "hint":
-            hint = self.eggs.get_random_hint()
-            self.ui.show_system_message(f"🔮 Hint: {hint}")
-        
+                self.ui.show_error(f"Unknown mode. Try: {', '.join(self.ai.get_available_modes())}")
         else:
-            self.ui.show_error(f"Unknown command: /{cmd}. Try /help")
+            self.console.print("Available modes:")
+            self.console.print(self.commands.get_mode_list())
+    
+    def _cmd_stats(self, args: list):
+        """/stats"""
+        stats = self.memory.get_session_summary()
+        self.ui.show_stats(stats)
+    
+    def _cmd_achievements(self, args: list):
+        """/achievements, /ach"""
+        unlocked = self.achievements.get_unlocked()
+        locked = self.achievements.get_locked()
+        progress = self.achievements.get_progress()
+        self.ui.show_achievements(unlocked, locked, progress)
+    
+    def _cmd_sound(self, args: list):
+        """/sound on|off"""
+        if args and args[0].lower() in ["on", "off"]:
+            enabled = args[0].lower() == "on"
+            self.animator.set_sound(enabled)
+            
+            # Also update global sound engine
+            self.sound.set_enabled(enabled)
+            
+            if enabled:
+                self.sound.play_notification_sound()
+            
+            self.ui.show_success(f"Sound effects {'enabled' if enabled else 'disabled'}")
+        else:
+            self.ui.show_system_message("Usage: /sound on|off")
+    
+    def _cmd_focus(self, args: list):
+        """/focus on|off"""
+        if args and args[0].lower() in ["on", "off"]:
+            enabled = args[0].lower() == "on"
+            self.focus_mode = enabled
+            self.animator.set_focus_mode(enabled)
+            self.ui.show_success(f"Focus mode {'enabled' if enabled else 'disabled'}")
+        else:
+            self.ui.show_system_message("Usage: /focus on|off")
+    
+    def _cmd_export(self, args: list):
+        """/export txt|md|json"""
+        if args:
+            format_type = args[0].lower()
+            self._export_chat(format_type)
+        else:
+            self.ui.show_system_message("Usage: /export txt|md|json")
+    
+    def _cmd_play(self, args: list):
+        """/play [game]"""
+        if args:
+            game = args[0].lower()
+            self._play_game(game)
+        else:
+            self.console.print("Available games:")
+            self.console.print(self.commands.get_game_list())
+    
+    def _cmd_name(self, args: list):
+        """/name <your_name>"""
+        if args:
+            name = " ".join(args)
+            self.memory.set_user_name(name)
+            self.ui.show_success(f"Nice to meet you, {name}! 👋")
+        else:
+            self.ui.show_system_message("Usage: /name <your_name>")
+    
+    def _cmd_bookmark(self, args: list):
+        """/bookmark - save the last message"""
+        if self.memory.add_bookmark():
+            self.ui.show_success("Bookmark saved! 📌")
+            self._queue_achievements({"bookmark_count": len(self.memory.bookmarks)})
+        else:
+            self.ui.show_error("Nothing to bookmark yet!")
+    
+    def _cmd_bookmarks(self, args: list):
+        """/bookmarks - list saved bookmarks"""
+        bookmarks = self.memory.get_bookmarks()
+        if bookmarks:
+            self.console.print("\n📚 Your Bookmarks:")
+            for i, bm in enumerate(bookmarks, 1):
+                self.console.print(f"  {i}. {bm.message_preview}")
+        else:
+            self.ui.show_system_message("No bookmarks yet. Use /bookmark to save a moment!")
+    
+    def _cmd_about(self, args: list):
+        """/about"""
+        self.ui.show_about()
+    
+    def _cmd_hint(self, args: list):
+        """/hint - easter egg hint"""
+        hint = self.eggs.get_random_hint()
+        self.ui.show_system_message(f"🔮 Hint: {hint}")
     
     # ============================================
     # CONVERSATION
@@ -430,6 +625,10 @@ class NovaMind:
     
     def _handle_conversation(self, user_input: str):
         """Handle regular conversation with AI"""
+        # One clock read per turn (achievements + mood history)
+        now = time.time()
+        self._last_message_time = now
+        
         # Display user message
         self.ui.show_user_message(user_input, self.memory.user_name)
         
@@ -439,39 +638,40 @@ class NovaMind:
         
         # Store user message
         self.memory.add_message("user", user_input, detected_mood.name)
-        self.mood.record_mood(time.time())
+        self.mood.record_mood(now)
         
         # Check for questions (for achievements)
         is_q = is_question(user_input)
         
-        # Thinking animation
-        self.console.print()
-        frames = self.style_manager.get_spinner_frames("dots")
-        theme = self.style_manager.theme
-        
-        # Show thinking
-        if not self.focus_mode:
-            for i in range(8):
-                frame = frames[i % len(frames)]
-                self.console.print(f"  {frame} Thinking...", style=theme.system_text, end="\r")
-                time.sleep(0.15)
-            self.console.print(" " * 30, end="\r")
-        
-        # Get AI response
+        # Get AI response - the request starts before the spinner so the
+        # two overlap. In animated mode the reply is streamed and typed as
+        # it arrives; the spinner only covers the wait for the first chunk.
         context = self.memory.get_context_for_ai()
         mood_hint = self.mood.suggest_response_tone()
         
-        response = self.ai.generate_response(user_input, context, mood_hint)
-        
-        # CRITICAL: Sanitize response before ANY rendering
-        # This strips model tokens like <|im_start|> that must NEVER be displayed
-        # CRITICAL: Sanitize response before ANY rendering
-        # This strips model tokens like <|im_start|> and system leakage that must NEVER be displayed
-        from core.sanitizer import sanitize_output
-        sanitized_response = sanitize_output(response)
-        
-        # Display AI response with typing animation
-        self._render_response_safely(sanitized_response, mood_emoji)
+        if self.focus_mode:
+            self.console.print()
+            response = self.ai.generate_response(user_input, context, mood_hint)
+            
+            # CRITICAL: Sanitize response before ANY rendering
+            # This strips model tokens like <|im_start|> and system leakage that must NEVER be displayed
+            self._render_response_safely(sanitize_output(response), mood_emoji)
+        else:
+            stream = self.ai.generate_streaming_response(user_input, context, mood_hint)
+            first_chunk = self._wait_with_spinner(_run_in_background(next, stream, ""))
+            
+            # Sanitized incrementally inside the streaming renderer. The
+            # repetition guard stays on the blocking path: it reflows
+            # ordinary text ("3.11" -> "3. 11"), so the typed box would
+            # never match it and every reply would be typed twice.
+            # A stream without text ends in the "no response" reply - it is
+            # never sent again as a blocking request.
+            response = self._type_response_stream(chain((first_chunk,), stream), mood_emoji)
+            self.response_rendered = True
+            
+            # An error after part of the reply was typed is shown apart
+            if self.ai.stream_error:
+                self.ui.show_error(self.ai.stream_error)
         
         # Store AI response
         self.memory.add_message("assistant", response)
@@ -482,7 +682,7 @@ class NovaMind:
         
         # Check achievements
         stats = self.memory.get_session_summary()
-        self._check_achievements({
+        self._queue_achievements({
             "message_count": stats["messages"],
             "total_words": stats["words"],
             "session_minutes": stats["duration_minutes"],
@@ -492,6 +692,32 @@ class NovaMind:
             "themes_used": self.memory.stats.themes_used,
         })
     
+    def _wait_with_spinner(self, future):
+        """Show the thinking spinner until future completes; return its result"""
+        self.console.print()
+        frames = self.style_manager.get_spinner_frames("dots")
+        theme = self.style_manager.theme
+        
+        # Frames are written directly with the color escape resolved once
+        color = self.theme_engine.get_fg_ansi_code(theme.system_text)
+        reset = "\033[39m" if color else ""
+        
+        i = 0
+        while not future.done():
+            # Checked before each frame: once the user starts typing, stop
+            # animating and just wait for the reply
+            if _input_pending():
+                break
+            frame = frames[i % len(frames)]
+            sys.stdout.write(f"{color}  {frame} Thinking...{reset}\r")
+            sys.stdout.flush()
+            wait((future,), timeout=0.15)
+            i += 1
+        sys.stdout.write(" " * 30 + "\r")
+        sys.stdout.flush()
+        
+        return future.result()
+    
     def _render_response_safely(self, response: str, mood_emoji: str):
         """Render response with safety checks to prevent duplication"""
         if hasattr(self, 'response_rendered') and self.response_rendered:
@@ -505,6 +731,10 @@ class NovaMind:
         self.response_rendered = True
     
     def _type_response(self, response: str, mood_emoji: str):
+        """Display an already sanitized AI response with typing animation"""
+        self._type_response_stream((response,), mood_emoji, finish=None)
+    
+    def _type_response_stream(self, chunks, mood_emoji: str, finish=sanitize_output) -> str:
         """Display AI response with typing animation - BOX-AWARE RENDERING
         
         FIXED IMPLEMENTATION:
@@ -513,37 +743,43 @@ class NovaMind:
         3. Render line-by-line with proper padding (no more cutting)
         
         Each character is printed EXACTLY ONCE with proper box boundaries.
-        """
-        from core.sounds import get_sound_simulator
-        from core.text_renderer import prepare_response_for_box, visible_width
-        import shutil
         
+        chunks is an iterable of raw text pieces (a streamed reply, or a
+        single complete reply) and finish gives the final text from the
+        whole of it (None: already clean). Lines are typed as soon as more
+        text can no longer change them, so the animation runs while the
+        rest of the reply is still coming; if the final text turns out to
+        differ from what was typed, the box is typed again.
+        Returns the final response text.
+        """
         theme = self.style_manager.theme
         current_mood = self.mood.get_current_mood()
-        speed_mod = current_mood.speed_modifier
-        sound = get_sound_simulator()
+        base_speed = current_mood.speed_modifier
+        play_key = self.sound.play_keystroke_sound if self.sound.enabled else None
         
         # ============================================
         # STEP 1: Calculate box dimensions
         # ============================================
-        terminal_width = shutil.get_terminal_size().columns
+        terminal_width = get_terminal_size()[0]
         box_width = min(70, terminal_width - 4)
         
         # ============================================
         # STEP 2: Pre-process and word-wrap response
-        # This converts **bold** to ANSI and wraps at word boundaries
+        # stream_box_lines sanitizes, converts **bold** to ANSI and wraps
+        # at word boundaries, each received piece once
         # ============================================
-        wrapped_lines, inner_width = prepare_response_for_box(
-            response, 
-            box_width=box_width,
-            terminal_width=terminal_width
-        )
+        _, inner_width = prepare_response_for_box("", box_width, terminal_width)
         
         # ============================================
         # STEP 3: Render box header (printed ONCE)
         # Get background ANSI code to ensure consistent theme
+        # (cached by the theme engine, rebuilt only when the theme changes)
         # ============================================
         bg_code = self.theme_engine.get_bg_ansi_code()
+        line_prefix = f"{bg_code}  │  "
+        
+        # Buffered writes; flushed when something should appear
+        write, flush = _typing_writer()
         
         # Calculate header dynamic width
         # Prefix: "  ╭─ {mood_emoji} NovaMind "
@@ -558,63 +794,99 @@ class NovaMind:
         dashes_needed = box_width - prefix_width - suffix_width
         dashes_needed = max(0, dashes_needed)
         
-        print(f"{bg_code}{header_prefix_text}{'─' * dashes_needed}╮", flush=True)
+        header = f"{bg_code}{header_prefix_text}{'─' * dashes_needed}╮\n"
+        write(header)
         # Top Empty Line: "  │" + spaces + "│"
         # Width: 3 ("  │") + (box_width - 3 - 2) + 2 (" │") ...
         # Standardize content row: "  │  " (5) + content + " │" (2)
         # top empty line should act like a content line but valid
         # inner_width is box_width - 7
         # So printing 5 chars prefix + inner_width spaces + 2 chars suffix = box_width
-        print(f"{bg_code}  │  {' ' * inner_width} │", flush=True)
+        empty_content_line = f"{bg_code}  │  {' ' * inner_width} │\n"
+        
+        # Footer border, kept for the end (or a box typed again)
+        # Prefix "  ╰" (width 3)
+        # Suffix "╯" (width 1)
+        # Dashes = box_width - 4
+        dashes_len = max(0, box_width - 4)
+        footer = f"{bg_code}  ╰{'─' * dashes_len}╯\n"
+        
+        write(empty_content_line)
+        flush()
+        
+        # Line endings (padding + right border) for every possible short
+        # line, built once - lines then reuse these and line_prefix as is
+        line_ends = [f"{' ' * i} │\n" for i in range(inner_width + 1)]
         
         # ============================================
         # STEP 4: Render each wrapped line with typing animation
         # ============================================
-        for line_idx, line in enumerate(wrapped_lines):
-            # Print line prefix with background code "  │  "
-            print(f"{bg_code}  │  ", end="", flush=True)
+        text = ""
+        speed_length = -1
+        typed = 0
+        lines = stream_box_lines(
+            chunks,
+            box_width=box_width,
+            terminal_width=terminal_width,
+            finish=finish
+        )
+        for line, text in lines:
+            if line is None:
+                # What was typed is void (e.g. a "Final Answer:" cut) - take
+                # the lines back while they are all still on screen, else
+                # close this box and type the reply into a new one
+                if typed < get_terminal_size()[1] - 2:
+                    write(f"\033[{typed}F\033[J")
+                else:
+                    write(empty_content_line)
+                    write(footer)
+                    write(header)
+                    write(empty_content_line)
+                flush()
+                typed = 0
+                continue
             
-            # Animate each character in this line
-            for char in line:
-                print(char, end="", flush=True)
-                
-                # Skip delay and sound for ANSI escape codes
-                if char == '\x1b':
+            # Long replies type faster so the whole animation stays within
+            # MAX_TYPING_SECONDS (estimated at the default per-char delay)
+            if len(text) != speed_length:
+                speed_length = len(text)
+                speed_mod = base_speed
+                estimated = speed_length * DEFAULT_CHAR_DELAY * speed_mod
+                if estimated > MAX_TYPING_SECONDS:
+                    speed_mod *= MAX_TYPING_SECONDS / estimated
+            
+            # Line prefix with background code "  │  " (goes out with the first chunk)
+            write(line_prefix)
+            
+            # Animate the line a word / punctuation chunk at a time:
+            # one write + flush + sleep per chunk instead of per character
+            for chunk, delay in _typing_chunks(line):
+                write(chunk)
+                if delay is None:
                     continue
+                flush()
                 
-                # Play typing sound for visible characters
-                if char.isalnum() and sound.enabled:
-                    sound.play_keystroke_sound()
+                # Play typing sound for chunks with visible characters
+                if play_key is not None and any(char.isalnum() for char in chunk):
+                    play_key()
                 
-                # Variable delay based on character type
-                if char in ".!?":
-                    time.sleep(0.08 * speed_mod)
-                elif char in ",;:":
-                    time.sleep(0.04 * speed_mod)
-                elif char == " ":
-                    time.sleep(0.01 * speed_mod)
-                else:
-                    time.sleep(0.02 * speed_mod)
+                time.sleep(delay * speed_mod)
             
             # Pad the rest of the line to align right border
             visible = visible_width(line)
-            padding_len = max(0, inner_width - visible)
-            padding = ' ' * padding_len
-            print(f"{padding} │", flush=True)
+            write(line_ends[max(0, inner_width - visible)])
+            typed += 1
         
         # ============================================
         # STEP 5: Render box footer with background code
         #Footer: "  ╰" + dashes + "╯"
         # ============================================
         # Bottom Empty Line
-        print(f"{bg_code}  │  {' ' * inner_width} │", flush=True)
+        write(empty_content_line)
+        write(footer)
+        flush()
         
-        # Border
-        # Prefix "  ╰" (width 3)
-        # Suffix "╯" (width 1)
-        # Dashes = box_width - 4
-        dashes_len = max(0, box_width - 4)
-        print(f"{bg_code}  ╰{'─' * dashes_len}╯", flush=True)
+        return finish(text) if finish is not None else text
     
     # ============================================
     # EASTER EGGS
@@ -632,7 +904,7 @@ class NovaMind:
             self.animator.celebration_animation()
         
         # Check achievements
-        self._check_achievements({
+        self._queue_achievements({
             "found_easter_egg": True,
             "easter_egg_id": egg.id
         })
@@ -674,13 +946,32 @@ class NovaMind:
     # ACHIEVEMENTS
     # ============================================
     
+    def _queue_achievements(self, context: dict):
+        """Add to this turn's achievement context (checked once per turn)"""
+        self._pending_ach_context.update(context)
+    
+    def _flush_achievements(self):
+        """Run the achievement check for the queued context, if any"""
+        if not self._pending_ach_context:
+            return
+        context = self._pending_ach_context
+        self._pending_ach_context = {}
+        self._check_achievements(context)
+    
     def _check_achievements(self, context: dict):
         """Check and award achievements"""
         newly_unlocked = self.achievements.check_and_award(context)
+        if not newly_unlocked:
+            return
         
-        for ach in newly_unlocked:
-            self.memory.record_achievement(ach.id)
-            self.ui.show_achievement_unlock(ach)
+        # Several unlocks can land at once - write their panels together
+        self.ui.begin_batch()
+        try:
+            for ach in newly_unlocked:
+                self.memory.record_achievement(ach.id)
+                self.ui.show_achievement_unlock(ach)
+        finally:
+            self.ui.end_batch()
     
     # ============================================
     # EXPORT
@@ -688,8 +979,6 @@ class NovaMind:
     
     def _export_chat(self, format_type: str):
         """Export chat history"""
-        from core.utils import save_to_file, save_json, get_exports_directory
-        
         exports_dir = get_exports_directory()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -720,7 +1009,7 @@ class NovaMind:
         else:
             self.ui.show_error("Unknown format. Try: txt, md, json")
     
-    def _apply_current_theme_bg(self):
+    def _apply_current_theme_bg(self, force: bool = False):
         """
         Apply current theme's background color to the ENTIRE terminal viewport.
         
@@ -733,9 +1022,16 @@ class NovaMind:
         The theme_engine.apply_full_background() method fills EVERY cell in the
         terminal with the background color by printing spaces, ensuring the
         entire viewport is colored (not just printed areas).
+        
+        Repainting with the background already on screen is skipped unless
+        force is set (/clear, which wipes the screen itself).
         """
         if hasattr(self.style_manager.theme, 'bg_rgb'):
-            r, g, b = self.style_manager.theme.bg_rgb
+            rgb = self.style_manager.theme.bg_rgb
+            if rgb == self._last_applied_bg and not force:
+                return
+            self._last_applied_bg = rgb
+            r, g, b = rgb
             # apply_full_background fills the ENTIRE terminal viewport
             self.theme_engine.apply_full_background(r, g, b)
 
@@ -1,32 +1,34 @@
-import sys
-import os
-
-# Ensure we can import core
-sys.path.append(os.getcwd())
-
 from core.logos import THEME_LOGOS, get_colored_logo
 
+_SEP = "-" * 40
+
 def check_logos():
     print("CHECKING ALL LOGOS IN core/logos.py")
     print("="*60)
     
     for theme, logo in THEME_LOGOS.items():
         print(f"\n[{theme.upper()} LOGO]")
-        print("-" * 40)
+        print(_SEP)
         
-        # Print raw logo to see shape
-        for line in logo.split('\n'):
-            if not line: continue
-            # Strip ANSI just in case, though raw string shouldn't have them in dictionary (usually)
-            # Actually core.logos definitions don't have ANSI in the dict keys, they are added by get_colored_logo
-            # But the 'warning' logo might rely on specific spacing.
-            
-            # Check width
-            width = len(line)
-            status = "OK" if width <= 80 else f"TOO WIDE ({width})"
-            print(f"{line}  <-- {status}")
+        # Print raw logo to see shape (one write for the whole block)
+        # core.logos definitions don't have ANSI in the dict, they are
+        # added by get_colored_logo - so len() is the width
+        lines = [line for line in logo.splitlines() if line]
+        print("\n".join(lines))
+        
+        # Check width: one pass for the worst line; per-line status is
+        # only formatted for offenders, when there are any
+        widths = list(map(len, lines))
+        worst = max(widths, default=0)
+        if worst <= 80:
+            print(f"[{theme}] OK (max {worst})")
+        else:
+            print(f"[{theme}] TOO WIDE (max {worst})")
+            for line, width in zip(lines, widths):
+                if width > 80:
+                    print(f"{line}  <-- TOO WIDE ({width})")
             
-        print("-" * 40)
+        print(_SEP)
 
 if __name__ == "__main__":
     check_logos()
@@ -1,10 +1,4 @@
 
-import sys
-import os
-
-# Ensure we can import core modules
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from core.ai_engine import AIEngine
 
 class MockResponse:
@@ -1,32 +1,56 @@
 import os
 import sys
 import time
+from contextlib import contextmanager
 from rich.console import Console
 
 if sys.platform == 'win32':
     os.system('')
 
+@contextmanager
+def console_color(attr, reset=0x07):
+    """
+    Set the Windows console text attribute (like `color 17`) for the
+    block via SetConsoleTextAttribute, restoring `reset` (07) on exit.
+    No-op on other platforms.
+    """
+    if sys.platform != 'win32':
+        yield
+        return
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+    kernel32.SetConsoleTextAttribute(handle, attr)
+    try:
+        yield
+    finally:
+        kernel32.SetConsoleTextAttribute(handle, reset)
+
+# ANSI codes only when they will be rendered (not redirected/CI logs)
+USE_ANSI = sys.stdout.isatty() and os.environ.get('TERM') != 'dumb'
+
 console = Console()
 console.print("Testing background colors...")
 
 print("Attempting to prevent auto-close...")
 # Method 1: ANSI Escape Codes (Standard)
 # Set background to Blue (44)
-print("\033[44m")
+if USE_ANSI:
+    sys.stdout.write("\033[44m")
 print("This should represent blue background text (ANSI).")
 print("Does it fill the screen? Probably not, just text background.")
-print("\033[0m") # Reset
-
-# Method 2: OS System Color (Windows only)
-# 1 = Blue, 7 = White
-print("Changing system color to 17 (Blue background, White text) in 2 seconds...")
-time.sleep(2)
-os.system('color 17')
-print("System color changed? This should fill screen.")
+if USE_ANSI:
+    sys.stdout.write("\033[0m") # Reset
 
+# Method 2: Console text attribute (Windows only)
+# 1 = Blue, 7 = White. Unlike `color 17` this colors text written from
+# now on, not cells already on screen - but spawns no cmd.exe.
+print("Changing console color to 17 (Blue background, White text) in 2 seconds...")
 time.sleep(2)
-print("Changing back to 07 (Black background, White text)...")
-os.system('color 07')
+with console_color(0x17):
+    print("Console color changed? New text should be white on blue.")
+    time.sleep(2)
+print("Changed back to 07 (Black background, White text).")
 
 # Method 3: Rich Console Style
 print("Testing Rich Console style...")
@@ -1,50 +1,116 @@
-
+import re
 import sys
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
-import re
+
+# Mojibake (UTF-8 read as cp1252, e.g. "ðŸŒ" for an emoji) folded to
+# one placeholder before comparing, so two garbled copies of the same
+# text still match. One char for one char: positions stay valid.
+# (cp1252 chars of the UTF-8 continuation bytes 0x80-0xBF, plus the
+# lead bytes that show up as Â Ã â ð)
+_MOJIBAKE = bytes(range(0x80, 0xC0)).decode('cp1252', 'ignore') + "ÂÃâð"
+_NORM = str.maketrans(_MOJIBAKE, "?" * len(_MOJIBAKE))
+
+# Whitespace-only gap between a block and its copy (matched in place
+# with pos/endpos, no slice of the text is made)
+_GAP_RE = re.compile(r'\s*')
+
+
+def suffix_array(s):
+    """Suffix array by prefix doubling (rank pairs sorted each round)"""
+    n = len(s)
+    sa = list(range(n))
+    rank = [ord(c) for c in s]
+    k = 1
+    while k < n:
+        key = lambda i: (rank[i], rank[i + k] if i + k < n else -1)
+        sa.sort(key=key)
+        new_rank = [0] * n
+        for j in range(1, n):
+            new_rank[sa[j]] = new_rank[sa[j - 1]] + (key(sa[j - 1]) != key(sa[j]))
+        rank = new_rank
+        if rank[sa[-1]] == n - 1:
+            break
+        k *= 2
+    return sa
+
+
+def _extend_match(s, a, b, h):
+    """
+    Grow a known common prefix h of s[a:] and s[b:]: slices are compared
+    in doubling steps (one C-level compare each), then halved back down.
+    """
+    n = len(s)
+    step = 8
+    while b + h < n and a + h < n and s[a + h:a + h + step] == s[b + h:b + h + step]:
+        h += step
+        step *= 2
+    while step > 1:
+        step //= 2
+        if s[a + h:a + h + step] == s[b + h:b + h + step] and a + h + step <= n and b + h + step <= n:
+            h += step
+    return min(h, n - a, n - b)
+
+
+def lcp_array(s, sa):
+    """Kasai: lcp[j] = common prefix length of suffixes sa[j-1] and sa[j]"""
+    n = len(s)
+    rank = [0] * n
+    for j, i in enumerate(sa):
+        rank[i] = j
+    lcp = [0] * n
+    h = 0
+    for i in range(n):
+        if rank[i] > 0:
+            prev = sa[rank[i] - 1]
+            h = _extend_match(s, i, prev, h)
+            lcp[rank[i]] = h
+            if h:
+                h -= 1
+        else:
+            h = 0
+    return lcp
+
+
+def find_repetition(text, min_len=20):
+    """
+    Longest block of at least min_len chars that is immediately repeated
+    (only whitespace between the copies), case-insensitive and with
+    mojibake normalized.
+    Returns (start, length, copy_start) or None.
+    """
+    s = text.translate(_NORM).lower()
+    sa = suffix_array(s)
+    lcp = lcp_array(s, sa)
+
+    best = None
+    for j in range(1, len(sa)):
+        length = lcp[j]
+        if length < min_len or (best and length <= best[1]):
+            continue
+        lo, hi = sorted((sa[j - 1], sa[j]))
+        # Tandem repeat: the copy starts where the block ends
+        # (a repeat overlapping itself, or separated only by whitespace)
+        if lo + length >= hi or _GAP_RE.fullmatch(s, lo + length, hi):
+            best = (lo, min(length, hi - lo), hi)
+    return best
+
 
 def test_fix():
     # The problem string (2 repetitions)
     text = "Did you know that a day on Venus is longer than a year on Venus? 🌍🪐 A single rotation takes about 243 Earth days, while its orbit around the Sun takes only about 225 Earth days Did you know that a day on Venus is longer than a year on Venus? 🌍🪐 A single rotation takes about 243 Earth days, while its orbit around the Sun takes only about 225 Earth days"
-    
-    # Try to find repeated patterns of significant length (e.g., > 20 chars)
-    # We use non-greedy matching for the content, but greedy for the repetition
-    match = re.search(r'(.{20,}?)\1+', text, re.DOTALL)
-    
-    # Proposed "Halves" logic
-    words = text.split()
-    if len(words) > 10:
-        half = len(words) // 2
-        # part1 covers first half of words
-        part1_words = words[:half]
-        # part2 covers second half of words
-        part2_words = words[half:] 
-        
-        # If odd number of words, lengths differ by 1.
-        # Let's align them.
-        min_len = min(len(part1_words), len(part2_words))
-        
-        s1 = ' '.join(part1_words[:min_len]).lower()
-        s2 = ' '.join(part2_words[:min_len]).lower()
-        
-        print(f"S1 ({len(s1)}): {s1[:30]}...")
-        print(f"S2 ({len(s2)}): {s2[:30]}...")
-        
-        # Use a tolerance or prefix match
-        if len(s1) > 20 and s1 == s2:
-             print("SUCCESS: Exact match detected in halves!")
-        elif len(s1) > 20 and s1[:min(len(s1), 100)] == s2[:min(len(s2), 100)]:
-             print("SUCCESS: Prefix match detected in halves!")
-        else:
-             print("FAILURE: No match in halves.")
-             # Debug why
-             # find first diff
-             for i in range(min(len(s1), len(s2))):
-                 if s1[i] != s2[i]:
-                     print(f"Diff at {i}: '{s1[i]}' vs '{s2[i]}'")
-                     print(f"Context: {s1[i-10:i+10]}")
-                     break
+
+    # Suffix array + LCP: adjacent suffixes sharing a prefix at least as
+    # long as the distance between them are a block and its repetition
+    found = find_repetition(text)
+
+    if found:
+        start, length, copy_start = found
+        print(f"Block ({length}): {text[start:start + 30]}...")
+        print(f"Copy at {copy_start}: {text[copy_start:copy_start + 30]}...")
+        print("SUCCESS: Repetition detected!")
+    else:
+        print("FAILURE: No repetition detected.")
 
 if __name__ == "__main__":
     test_fix()
@@ -1,14 +1,16 @@
+_SEP = "-" * 60
+
 
 def print_logo(name, logo):
     print(f"\n[{name.upper()}]")
-    print("-" * 60)
+    print(_SEP)
     lines = logo.split('\n')
     max_w = 0
     for line in lines:
         if line.strip():
             print(line)
             max_w = max(max_w, len(line))
-    print("-" * 60)
+    print(_SEP)
     print(f"Max Width: {max_w}")
 
 # ---------------------------------------------------------
@@ -1,7 +1,6 @@
 
 import os
 import unittest
-from unittest.mock import MagicMock, patch
 from core.ai_engine import AIEngine, get_ai_engine
 
 class TestRateLimitLoop(unittest.TestCase):
@@ -22,13 +21,18 @@ class TestRateLimitLoop(unittest.TestCase):
             }
         }
         
-        with patch.object(self.ai, '_make_api_request', return_value=mock_response):
+        # Plain function on the instance (no MagicMock machinery per retry);
+        # deleting it afterwards uncovers the class method again
+        self.ai._make_api_request = lambda messages: mock_response
+        try:
             # This should NOT hang or crash
             response = self.ai.generate_response("Hello")
             
             print(f"Response: {response}")
             self.assertIn("All API keys are currently overloaded", response)
             self.assertLessEqual(self.ai.current_key_index, 1) # Should handle indices correctly
+        finally:
+            del self.ai._make_api_request
             
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,4 @@
 
-import os
-import sys
-
-# Add project root to path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from core.logos import get_all_theme_names, print_logo, get_compact_logo
 
 def test_logos():
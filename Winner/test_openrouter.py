@@ -26,6 +26,11 @@ headers = {
     "X-Title": "NovaMind CLI Chatbot"
 }
 
+# One session for all models: the keep-alive connection (and its TLS
+# handshake) is reused instead of reconnecting per request
+session = requests.Session()
+session.headers.update(headers)
+
 # Try with a simple model first
 test_models = [
     "google/gemini-2.0-flash-exp:free",
@@ -49,9 +54,8 @@ for model in test_models:
     }
     
     try:
-        response = requests.post(
+        response = session.post(
             OPENROUTER_API_URL,
-            headers=headers,
             json=payload,
             timeout=30
         )
@@ -73,5 +77,7 @@ for model in test_models:
     except Exception as e:
         print(f"Exception: {e}")
 
+session.close()
+
 print("\n" + "="*50)
 print("Test complete!")
@@ -1,15 +1,31 @@
+import sys
 import time
 from core.sounds import get_sound_simulator
 
 s = get_sound_simulator()
 s.set_enabled(True)
 
+message = "Hello World"
+# Which characters get a keystroke tick, worked out once up front
+ticks = [c.isalnum() for c in message]
+
+# Characters are collected and flushed to the console every FLUSH_EVERY
+# chars (or at a newline) instead of one print + flush per character
+FLUSH_EVERY = 4
+write = sys.stdout.write
+pending = []
+
 print("Simulating AI typing with sound...")
-for c in "Hello World":
-    print(c, end="", flush=True)
-    if c.isalnum():
+for c, tick in zip(message, ticks):
+    pending.append(c)
+    if len(pending) >= FLUSH_EVERY or c == "\n":
+        write("".join(pending))
+        pending.clear()
+        sys.stdout.flush()
+    if tick:
         s.play_keystroke_sound()
     time.sleep(0.05)
 
+write("".join(pending))
 print()
 print("Test complete")
@@ -1,12 +1,7 @@
 
-import sys
-import os
 import time
 import threading
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from core.sound_engine import get_sound_engine
 
 def test_sound_latency():
@@ -16,17 +11,22 @@ def test_sound_latency():
     print("Testing sound engine...")
     print(f"Backend: {engine.system}")
     
-    start_time = time.time()
+    queue_keystroke_sound = engine.queue_keystroke_sound
+    interval_ns = 10_000_000  # 10ms typing speed (very fast)
+    
+    start_ns = time.perf_counter_ns()
     
     # Simulate fast typing
     print("Simulating fast typing (100 chars)...")
-    for i in range(100):
+    for i in range(1, 101):
         # This loop should complete almost instantly if non-blocking
-        engine.queue_keystroke_sound()
-        time.sleep(0.01) # 10ms typing speed (very fast)
+        queue_keystroke_sound()
+        # Sleep until this keystroke's deadline (monotonic clock), so
+        # loop overhead does not add up over the 100 iterations
+        deadline = start_ns + i * interval_ns
+        time.sleep(max(0, deadline - time.perf_counter_ns()) / 1e9)
         
-    end_time = time.time()
-    duration = end_time - start_time
+    duration = (time.perf_counter_ns() - start_ns) / 1e9
     
     print(f"Typing simulation took: {duration:.4f}s")
     
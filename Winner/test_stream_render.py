@@ -0,0 +1,156 @@
+"""
+Tests for the streaming reply path: sanitize_stream, the incremental
+line filler and stream_box_lines (including the void / retype case).
+"""
+
+import unittest
+
+from core.sanitizer import sanitize_output, sanitize_stream
+from core.text_renderer import (
+    _LineFiller,
+    prepare_response_for_box,
+    stream_box_lines,
+    wrap_text_preserve_ansi,
+    ANSI_BOLD,
+    ANSI_RESET
+)
+
+REPLIES = [
+    "Hello! Python 3.11 is out, e.g. with faster startup.\n\nIt also has:\n- better errors\n- **TaskGroup** for asyncio",
+    "Assistant: Sure thing.\nNovaMind: Here is a **bold** claim that wraps over a few lines of the box.",
+    "<|im_start|>assistant\nA reply with tokens<|im_end|> and a trailing </s>",
+    "```python\nAssistant: kept inside code\n```\nThe user is asking about code\nDone.",
+    "Reasoning: the user wants a fact about space, so say something nice.\nFinal Answer: Venus has a day longer than its year.",
+    "",
+]
+
+
+def split_every(text, size):
+    """text as pieces of size chars, like a stream delivering it"""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def collect(stream):
+    """Items after the last None marker, and how many markers there were"""
+    items = []
+    resets = 0
+    for item in stream:
+        if item is None:
+            items = []
+            resets += 1
+        else:
+            items.append(item)
+    return items, resets
+
+
+class TestSanitizeStream(unittest.TestCase):
+    def test_matches_sanitize_output(self):
+        for reply in REPLIES:
+            for size in range(1, 8):
+                pieces, _ = collect(sanitize_stream(split_every(reply, size)))
+                self.assertEqual("".join(pieces), sanitize_output(reply), (reply, size))
+
+    def test_final_answer_voids_earlier_text(self):
+        reply = "Intro line that is long enough to be decided early on.\nFinal Answer: 42"
+        items = list(sanitize_stream(split_every(reply, 4)))
+        self.assertIn(None, items)
+        pieces, resets = collect(items)
+        self.assertEqual(resets, 1)
+        self.assertEqual("".join(pieces), "42")
+
+    def test_reasoning_preamble_is_held_back(self):
+        reply = REPLIES[4]
+        items = list(sanitize_stream(split_every(reply, 3)))
+        # No reasoning text is ever yielded, not even before the cut
+        self.assertEqual("".join(item for item in items if item is not None),
+                         "Venus has a day longer than its year.")
+
+
+class TestLineFiller(unittest.TestCase):
+    def test_pieces_match_whole_text(self):
+        text = f"Some {ANSI_BOLD}bold{ANSI_RESET} words and a supercalifragilisticexpialidocious one\n\nnext paragraph"
+        expected = wrap_text_preserve_ansi(text, 12)
+        # Feed a word at a time, split at the spaces and newlines
+        filler = _LineFiller(12)
+        lines = []
+        start = 0
+        for end, char in enumerate(text):
+            if char in " \n":
+                lines.extend(filler.feed(text[start:end]))
+                start = end
+        lines.extend(filler.feed(text[start:]))
+        lines.extend(filler.finish())
+        self.assertEqual(lines, expected)
+
+    def test_lines_are_final_when_returned(self):
+        filler = _LineFiller(10)
+        self.assertEqual(filler.feed("one two"), [])
+        self.assertEqual(filler.feed(" three"), ["one two"])
+        self.assertEqual(filler.feed("\n"), ["three"])
+        self.assertEqual(filler.finish(), [""])
+
+    def test_wrap_preserve_ansi(self):
+        self.assertEqual(wrap_text_preserve_ansi("", 10), [""])
+        self.assertEqual(wrap_text_preserve_ansi("a\n\nb", 10), ["a", "", "b"])
+        self.assertEqual(wrap_text_preserve_ansi("abcdefghijkl", 5), ["abcde", "fghij", "kl"])
+
+
+class TestStreamBoxLines(unittest.TestCase):
+    def expected(self, reply, box_width):
+        return prepare_response_for_box(sanitize_output(reply), box_width, 100)[0]
+
+    def test_final_lines_match_box(self):
+        for reply in REPLIES:
+            for size in (1, 5, 13):
+                lines, _ = collect(
+                    line for line, _ in stream_box_lines(split_every(reply, size), 40, 100)
+                )
+                self.assertEqual(lines, self.expected(reply, 40), (reply, size))
+
+    def test_plain_reply_is_typed_once(self):
+        # Numbers, abbreviations and several lines must not trigger a retype
+        reply = REPLIES[0]
+        _, resets = collect(line for line, _ in stream_box_lines(split_every(reply, 3), 40, 100))
+        self.assertEqual(resets, 0)
+
+    def test_lines_come_before_the_stream_ends(self):
+        reply = "word " * 100
+        pieces = split_every(reply, 7)
+        received = []
+
+        def chunks():
+            for piece in pieces:
+                received.append(piece)
+                yield piece
+
+        first_line, raw = next(stream_box_lines(chunks(), 40, 100))
+        self.assertTrue(first_line.startswith("word"))
+        self.assertLess(len(received), len(pieces))
+        self.assertEqual(raw, "".join(received))
+
+    def test_final_answer_retypes_box(self):
+        reply = "Intro line that is shown before the cut, long enough to be decided early.\nFinal Answer: **X** wins"
+        items = [line for line, _ in stream_box_lines(split_every(reply, 5), 40, 100)]
+        self.assertIn(None, items)
+        self.assertNotEqual(items[0], None)
+        lines, _ = collect(items)
+        self.assertEqual(lines, [f"{ANSI_BOLD}X{ANSI_RESET} wins"])
+
+    def test_differing_final_text_retypes_box(self):
+        reply = "one two three four five six seven eight nine ten eleven twelve"
+        items = [
+            line for line, _ in
+            stream_box_lines(split_every(reply, 4), 30, 100, finish=lambda raw: "something else")
+        ]
+        lines, resets = collect(items)
+        self.assertEqual(resets, 1)
+        self.assertEqual(lines, ["something else"])
+
+    def test_clean_text_skips_sanitizer(self):
+        reply = "Assistant: stays as typed"
+        items = [line for line, _ in stream_box_lines([reply], 40, 100, finish=None)]
+        self.assertEqual(items, ["Assistant: stays as typed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,8 @@ Verifies ANSI-safe width, word wrapping, and markdown bold conversion.
 """
 
 import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rich.cells import cell_len
 
 from core.text_renderer import (
     strip_ansi,
@@ -14,6 +14,7 @@ from core.text_renderer import (
     wrap_text,
     wrap_text_preserve_ansi,
     prepare_response_for_box,
+    ANSI_ESCAPE_PATTERN,
     ANSI_BOLD,
     ANSI_RESET
 )
@@ -123,17 +124,20 @@ The second paragraph also has **bold text** that should render correctly without
     print(f"  - Inner width: {inner_width}")
     print(f"  - Total lines: {len(lines)}")
     
+    # Strip ANSI codes once, reused by both checks below
+    strip = ANSI_ESCAPE_PATTERN.sub
+    stripped_lines = [strip('', line) for line in lines]
+    
     # Check no asterisks
-    full_text = '\n'.join(lines)
-    assert "**" not in strip_ansi(full_text), "Raw asterisks found!"
+    assert not any("**" in line for line in stripped_lines), "Raw asterisks found!"
     print(f"  - No raw asterisks: PASS")
     
     # Check line widths
-    for i, line in enumerate(lines):
-        vis_width = visible_width(line)
+    for i, line in enumerate(stripped_lines):
+        vis_width = cell_len(line)
         if vis_width > inner_width:
             print(f"  ⚠️ Line {i} exceeds width: {vis_width} > {inner_width}")
-            print(f"     '{strip_ansi(line)}'")
+            print(f"     '{line}'")
     print(f"  - Line width check: PASS")
 
 
@@ -1,15 +1,9 @@
-import sys
-import os
-
-# Add current dir to path
-sys.path.insert(0, os.getcwd())
-
 try:
     from core.styles import get_style_manager, THEMES
-    from core.theme_engine import get_theme_engine
+    from core.theme_engine import theme_engine
     
     sm = get_style_manager()
-    te = get_theme_engine()
+    te = theme_engine
     
     print("Imports successful!")
     print(f"Themes available: {list(THEMES.keys())}")
@@ -1,30 +1,34 @@
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from core.logos import get_colored_logo
 
+# 80-column ruler and separator lines
+_RULER = "1234567890" * 8 + "\n"
+_SEP = "-" * 80 + "\n"
+
 def verify():
+    # Strip ansi for checking width roughly, or keep it?
+    # get_colored_logo returns ANSI.
+    # Let's write the raw logo string from logos key just in case, 
+    # but better to test the function.
+    # However, `print_logo` does centering logic.
+    # I will replicate print_logo logic or just grab the raw text from logos.py
+    from core.logos import THEME_LOGOS
+    
+    # Whole report built first, then written with a single call
+    report = "".join((
+        "RULER (80 chars):\n",
+        _RULER,
+        _SEP,
+        "\n>>> HACKER LOGO <<<\n",
+        THEME_LOGOS["hacker"],
+        "\n\n>>> OCEAN LOGO <<<\n",
+        THEME_LOGOS["ocean"],
+        "\n",
+        _SEP,
+    ))
+    
     with open("verification_result.txt", "w", encoding="utf-8") as f:
-        f.write("RULER (80 chars):\n")
-        f.write("1234567890" * 8 + "\n")
-        f.write("-" * 80 + "\n")
-        
-        f.write("\n>>> HACKER LOGO <<<\n")
-        # Strip ansi for checking width roughly, or keep it?
-        # get_colored_logo returns ANSI.
-        # Let's write the raw logo string from logos key just in case, 
-        # but better to test the function.
-        # However, `print_logo` does centering logic.
-        # I will replicate print_logo logic or just grab the raw text from logos.py
-        
-        from core.logos import THEME_LOGOS
-        f.write(THEME_LOGOS["hacker"])
-        
-        f.write("\n\n>>> OCEAN LOGO <<<\n")
-        f.write(THEME_LOGOS["ocean"])
-        
-        f.write("\n" + "-" * 80 + "\n")
+        f.write(report)
 
 if __name__ == "__main__":
     verify()